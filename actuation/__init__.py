@@ -0,0 +1,2 @@
+from actuation.muscle_model import McKibbenMuscle, PressureLookupTable
+from actuation.actuation_optimizer import optimize_actuation, optimize_actuation_trajectory
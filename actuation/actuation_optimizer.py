@@ -1,17 +1,73 @@
+from collections import namedtuple
 import numpy as np
-from scipy.optimize import minimize
-from muscle_model import McKibbenMuscle
 
-def optimize_actuation(target_angle, initial_guess):
-    muscle = McKibbenMuscle(max_force=100, rest_length=1.0)
+BOUNDS = [(0.1, 5), (0.0, 1.0)]
+
+ActuationTrajectory = namedtuple("ActuationTrajectory", ["pressure", "contraction", "cost", "converged", "iterations"])
+
+def actuation_cost(x, target_angle):
+    pressure, contraction = x
+    error = (target_angle - contraction * np.pi) ** 2  # Simplified mapping
+    energy = pressure**2 + contraction**2
+    return 10 * error + energy
 
-    def cost_function(x):
-        pressure, contraction = x
-        force = muscle.force(pressure, contraction)
-        error = np.abs(target_angle - contraction * np.pi)  # Simplified mapping
-        energy = pressure**2 + contraction**2
-        return 10 * error + energy
+def actuation_cost_gradient(x, target_angle):
+    """Analytic gradient of actuation_cost with respect to (pressure, contraction)."""
+    pressure, contraction = x
+    d_error = -2 * np.pi * (target_angle - contraction * np.pi)
+    return np.array([2 * pressure, 10 * d_error + 2 * contraction])
 
-    bounds = [(0.1, 5), (0.0, 1.0)]
-    result = minimize(cost_function, initial_guess, bounds=bounds)
+def optimize_actuation(target_angle, initial_guess):
+    from scipy.optimize import minimize
+
+    result = minimize(actuation_cost, initial_guess, args=(target_angle,),
+                      jac=actuation_cost_gradient, bounds=BOUNDS)
     return result.x, result.fun
+
+def _trajectory_cost(flat, target_angles):
+    """Summed actuation_cost of a chunk and its gradient; flat holds (pressure, contraction) per point."""
+    x = flat.reshape(2, -1)
+    return np.sum(actuation_cost(x, target_angles)), actuation_cost_gradient(x, target_angles).ravel()
+
+def _optimize_chunk(target_angles, initial_guess):
+    from scipy.optimize import minimize
+
+    n = len(target_angles)
+    guess = np.repeat(np.asarray(initial_guess, dtype=float), n)
+    result = minimize(_trajectory_cost, guess, args=(target_angles,), jac=True,
+                      bounds=[BOUNDS[0]] * n + [BOUNDS[1]] * n, options={"ftol": 1e-12, "gtol": 1e-10})
+    x = result.x.reshape(2, -1)
+    out = np.empty((n, 5))
+    out[:, :2] = x.T
+    out[:, 2] = actuation_cost(x, target_angles)
+    out[:, 3] = result.success
+    out[:, 4] = result.nit
+    return out
+
+def optimize_actuation_trajectory(target_angles, initial_guess=(1.0, 0.5), workers=1, chunk_size=256):
+    """
+    Pressure and contraction commands for a whole joint-angle trajectory.
+
+    The points do not interact, so each chunk of chunk_size points is solved
+    as one bounded problem over all of its pressures and contractions, with
+    the analytic gradient, instead of one minimize call per point. Run
+    serially, every chunk starts from the previous chunk's last solution;
+    with workers > 1 the chunks are solved in a process pool and start from
+    initial_guess. Returns an ActuationTrajectory of per-point arrays
+    (converged and iterations are those of the point's chunk).
+    """
+    target_angles = np.asarray(target_angles, dtype=float).ravel()
+    chunks = [target_angles[start:start + chunk_size] for start in range(0, len(target_angles), chunk_size)]
+    if workers == 1 or len(chunks) <= 1:
+        results = []
+        guess = initial_guess
+        for chunk in chunks:
+            results.append(_optimize_chunk(chunk, guess))
+            guess = results[-1][-1, :2]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_optimize_chunk, chunks, [initial_guess] * len(chunks)))
+    out = np.concatenate(results) if results else np.empty((0, 5))
+    return ActuationTrajectory(out[:, 0], out[:, 1], out[:, 2], out[:, 3].astype(bool), out[:, 4].astype(int))
\ No newline at end of file
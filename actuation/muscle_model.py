@@ -1,14 +1,138 @@
+import hashlib
+import os
 import numpy as np
 
 class McKibbenMuscle:
     def __init__(self, max_force, rest_length):
         self.max_force = max_force
         self.rest_length = rest_length
+        self._tables = {}
 
     def force(self, pressure, contraction_ratio):
         """
         Simplified force model: F = P * A_eff * efficiency
+
+        pressure and contraction_ratio may be arrays; they broadcast together.
         """
+        pressure = np.asarray(pressure, dtype=float)
+        contraction_ratio = np.asarray(contraction_ratio, dtype=float)
         efficiency = 1 - contraction_ratio  # simplistic
         area_eff = 0.785  # example: effective area in cm²
         return pressure * area_eff * efficiency
+
+    def pressure_table(self, cache_dir=None, **kwargs):
+        """
+        Inverse lookup table P(F, c) for this muscle, see PressureLookupTable.build.
+
+        The table is kept on the instance and, with cache_dir, saved to and
+        reloaded from disk per (max_force, rest_length) configuration.
+        """
+        key = tuple(sorted(kwargs.items()))
+        if key not in self._tables:
+            path = None
+            if cache_dir:
+                config = (self.max_force, self.rest_length, key)
+                digest = hashlib.sha1(repr(config).encode()).hexdigest()[:16]
+                path = os.path.join(cache_dir, f"pressure-lut-{digest}.npz")
+            if path and os.path.exists(path):
+                table = PressureLookupTable.load(path)
+            else:
+                table = PressureLookupTable.build(self, **kwargs)
+                if path:
+                    table.save(path)
+            self._tables[key] = table
+        return self._tables[key]
+
+    def pressure_for_force(self, force, contraction_ratio):
+        """Pressure command producing `force` at `contraction_ratio`, via the default table."""
+        return self.pressure_table().pressure(force, contraction_ratio)
+
+
+class PressureLookupTable:
+    def __init__(self, levels, contractions, pressures, force_min, force_max, max_error):
+        """
+        Inverse force model tabulated on a regular (level, contraction) grid.
+
+        level is the force normalized to [0, 1] between the smallest and
+        largest force the muscle produces at that contraction (force_min,
+        force_max per grid column), so saturation never falls inside a cell.
+        """
+        self.levels = levels
+        self.contractions = contractions
+        self.pressures = pressures
+        self.force_min = force_min
+        self.force_max = force_max
+        self.max_error = max_error
+
+    @classmethod
+    def build(cls, muscle, pressure_range=(0.1, 5.0), contraction_range=(0.0, 0.9),
+              tolerance=1e-3, pressure_samples=1024, max_points=1025):
+        """
+        Tabulate the inverse of muscle.force over the given operating ranges.
+
+        Each contraction column is inverted from pressure_samples evaluations of
+        the (monotonic in pressure) force model, so no optimizer is involved.
+        The grid is refined until the interpolation error at the cell midpoints
+        is below tolerance (in pressure units) or max_points per axis is reached.
+        """
+        p = np.linspace(pressure_range[0], pressure_range[1], pressure_samples)
+
+        def invert(levels, contractions):
+            column_forces = muscle.force(p[:, np.newaxis], contractions)
+            f_min, f_max = column_forces[0], column_forces[-1]
+            forces = f_min + np.multiply.outer(levels, f_max - f_min)
+            pressures = np.stack([np.interp(forces[:, j], column_forces[:, j], p)
+                                  for j in range(len(contractions))], axis=1)
+            return pressures, forces, f_min, f_max
+
+        n = 9
+        while True:
+            levels = np.linspace(0, 1, n)
+            contractions = np.linspace(contraction_range[0], contraction_range[1], n)
+            pressures, _, f_min, f_max = invert(levels, contractions)
+            table = cls(levels, contractions, pressures, f_min, f_max, None)
+
+            mid_levels = (levels[:-1] + levels[1:]) / 2
+            mid_contractions = (contractions[:-1] + contractions[1:]) / 2
+            expected, forces, _, _ = invert(mid_levels, mid_contractions)
+            error = np.abs(table.pressure(forces, mid_contractions) - expected)
+            table.max_error = float(error.max())
+            if table.max_error <= tolerance or n >= max_points:
+                return table
+            n = min(2 * n - 1, max_points)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data["levels"], data["contractions"], data["pressures"],
+                       data["force_min"], data["force_max"], float(data["max_error"]))
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, levels=self.levels, contractions=self.contractions, pressures=self.pressures,
+                 force_min=self.force_min, force_max=self.force_max, max_error=self.max_error)
+        os.replace(tmp, path)
+
+    def pressure(self, force, contraction_ratio):
+        """
+        Bilinear lookup of the pressure producing `force` at `contraction_ratio`.
+
+        Inputs broadcast. Contractions are clamped to the table range and
+        forces the muscle cannot produce there to the pressure range limits.
+        """
+        c = self.contractions
+        x = np.clip((np.asarray(contraction_ratio, dtype=float) - c[0]) / (c[1] - c[0]), 0, len(c) - 1)
+        j = np.minimum(x.astype(np.intp), len(c) - 2)
+        u = x - j
+
+        f_min = (1 - u) * self.force_min[j] + u * self.force_min[j + 1]
+        f_max = (1 - u) * self.force_max[j] + u * self.force_max[j + 1]
+        level = np.clip((np.asarray(force, dtype=float) - f_min) / (f_max - f_min), 0, 1)
+        s = level * (len(self.levels) - 1)
+        i = np.minimum(s.astype(np.intp), len(self.levels) - 2)
+        t = s - i
+
+        P = self.pressures
+        return ((1 - t) * (1 - u) * P[i, j] + t * (1 - u) * P[i + 1, j]
+                + (1 - t) * u * P[i, j + 1] + t * u * P[i + 1, j + 1])
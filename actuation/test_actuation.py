@@ -1,7 +1,43 @@
 import numpy as np
-from actuation_optimizer import optimize_actuation
+from actuation.actuation_optimizer import optimize_actuation
 
 def test_optimization_output():
     (pressure, contraction), cost = optimize_actuation(np.pi / 2, (1.0, 0.5))
     assert 0.1 <= pressure <= 5
     assert 0.0 <= contraction <= 1.0
+
+def test_trajectory_optimization():
+    from actuation.actuation_optimizer import optimize_actuation_trajectory
+
+    targets = np.linspace(0.2, 3.0, 40)
+    result = optimize_actuation_trajectory(targets)
+    assert result.pressure.shape == result.contraction.shape == result.converged.shape == (40,)
+    assert np.all((0.1 <= result.pressure) & (result.pressure <= 5))
+    # squared tracking error: the optimum trades a little tracking for energy
+    expected = np.clip(10 * np.pi * targets / (10 * np.pi**2 + 1), 0.0, 1.0)
+    assert np.allclose(result.contraction, expected, atol=1e-6) and result.converged.all()
+    for target, contraction in zip(targets[::10], result.contraction[::10]):
+        (_, expected), _ = optimize_actuation(target, (1.0, 0.5))
+        assert np.isclose(contraction, expected, atol=1e-4)
+
+    pooled = optimize_actuation_trajectory(targets, workers=2, chunk_size=10)
+    assert np.allclose(pooled.contraction, result.contraction, atol=1e-4)
+
+def test_muscle_pressure_lookup_table(tmp_path):
+    from actuation.muscle_model import McKibbenMuscle
+
+    muscle = McKibbenMuscle(max_force=100, rest_length=1.0)
+    rng = np.random.default_rng(0)
+    pressure = rng.uniform(0.1, 5.0, 1000)
+    contraction = rng.uniform(0.0, 0.9, 1000)
+    force = muscle.force(pressure, contraction)
+    assert force.shape == (1000,)
+
+    table = muscle.pressure_table(cache_dir=str(tmp_path))
+    assert table.max_error <= 1e-3
+    assert np.allclose(table.pressure(force, contraction), pressure, atol=1e-3)
+    assert table.pressure(1e6, 0.5) == 5.0
+
+    reloaded = McKibbenMuscle(max_force=100, rest_length=1.0).pressure_table(cache_dir=str(tmp_path))
+    assert len(list(tmp_path.iterdir())) == 1
+    assert np.array_equal(reloaded.pressures, table.pressures)
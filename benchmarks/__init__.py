@@ -0,0 +1 @@
+# Benchmark scripts: python benchmarks/suite.py or python -m benchmarks.suite
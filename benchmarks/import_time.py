@@ -0,0 +1,101 @@
+"""Import-time regression check.
+
+Each entry point is imported in a fresh interpreter with ``python -X importtime``.
+The cumulative time of the modules it pulls in (interpreter startup excluded) is
+compared with the stored baseline, and the run fails when an entry point gets
+slower than ``threshold`` times its baseline or imports a heavy dependency it
+should only load on first use.
+
+    python benchmarks/import_time.py            # compare with import_baseline.json
+    python benchmarks/import_time.py --update   # record a new baseline
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "import_baseline.json")
+
+HEAVY_MODULES = ("matplotlib", "tkinter", "scipy")
+
+ENTRY_POINTS = ("kinematics", "kinematics.workspace", "kinematics.ik_solver", "actuation", "control",
+                "control.gain_tuning", "visualization", "interface.cli", "interface.gui")
+
+def _run_importtime(code):
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                          capture_output=True, text=True, check=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        if not cumulative_us.strip().isdigit():
+            continue  # header "self [us] | cumulative | imported package"
+        rows.append((name[1:].rstrip(), int(cumulative_us)))
+    return rows
+
+def measure_import(module, repeat=5):
+    """Return (best cumulative import time in ms, set of modules imported) for a module."""
+    startup = {name.strip() for name, _ in _run_importtime("pass")}
+    best = None
+    imported = set()
+    for _ in range(repeat):
+        rows = _run_importtime(f"import {module}")
+        total = sum(us for name, us in rows if not name.startswith(" ") and name not in startup)
+        imported = {name.strip() for name, _ in rows}
+        best = total if best is None else min(best, total)
+    return best / 1000.0, imported
+
+def heavy_imports(imported):
+    return sorted(name for name in imported
+                  if any(name == heavy or name.startswith(heavy + ".") for heavy in HEAVY_MODULES))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check import times of the simulator entry points.")
+    parser.add_argument("--update", action="store_true", help="Overwrite the stored baseline.")
+    parser.add_argument("--threshold", type=float, default=1.5,
+                        help="Allowed slowdown factor against the baseline (default 1.5).")
+    parser.add_argument("--slack-ms", type=float, default=15.0,
+                        help="Absolute tolerance added to every budget to absorb noise.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.update:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["modules"]
+
+    results = {}
+    failures = []
+    for module in ENTRY_POINTS:
+        elapsed, imported = measure_import(module, args.repeat)
+        results[module] = round(elapsed, 2)
+        status = "ok"
+        heavy = heavy_imports(imported)
+        if heavy:
+            status = "HEAVY"
+            failures.append(f"{module} imports {', '.join(heavy)}")
+        if module in baseline:
+            budget = baseline[module] * args.threshold + args.slack_ms
+            if elapsed > budget:
+                status = "SLOW"
+                failures.append(f"{module}: {elapsed:.1f} ms > {budget:.1f} ms budget")
+            print(f"{module:24s} {elapsed:8.1f} ms  (baseline {baseline[module]:.1f} ms)  {status}")
+        else:
+            print(f"{module:24s} {elapsed:8.1f} ms  {status}")
+
+    if args.update:
+        with open(args.baseline, "w") as f:
+            json.dump({"python": sys.version.split()[0], "modules": results}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+
+    for failure in failures:
+        print(f"Regression: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
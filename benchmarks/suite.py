@@ -0,0 +1,294 @@
+"""Benchmark suite for the simulator hot paths.
+
+Every benchmark is a setup function that receives a batch size and returns a
+callable processing that many items (poses, targets, controller steps, arms or
+frames). Each case is timed over several repeats and reported as latency per
+call, latency per item and throughput; the best repeat is used for comparisons
+because it is the least sensitive to scheduler noise.
+
+    python benchmarks/suite.py                        # run, compare with baseline.json
+    python benchmarks/suite.py --output run.json      # also store the results
+    python benchmarks/suite.py --update-baseline      # record a new baseline
+    python benchmarks/suite.py --filter ik --sizes 1 1000
+
+The exit status is 1 when a case is slower per item than its baseline by more
+than --threshold (a fraction, 0.5 = 50 %).
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from collections import namedtuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import numpy as np
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+Benchmark = namedtuple("Benchmark", ["name", "setup", "sizes", "unit"])
+BenchmarkResult = namedtuple("BenchmarkResult", ["name", "size", "repeats", "best", "median", "per_item",
+                                                 "throughput", "unit"])
+
+def _random_angles(n, seed=0):
+    return np.random.default_rng(seed).uniform(-np.pi, np.pi, size=(n, 2))
+
+def _random_targets(n, seed=0):
+    rng = np.random.default_rng(seed)
+    radius = rng.uniform(0.2, 1.9, n)
+    phi = rng.uniform(-np.pi, np.pi, n)
+    return np.column_stack([radius * np.cos(phi), radius * np.sin(phi)])
+
+def setup_fk_pose(size):
+    from kinematics import ForearmKinematics
+
+    angles = _random_angles(size)
+    arm = ForearmKinematics([(1.0, 0, 0, 0.0), (1.0, 0, 0, 0.0)])
+
+    def run():
+        for theta1, theta2 in angles:
+            arm.dh_params = [(1.0, 0, 0, theta1), (1.0, 0, 0, theta2)]
+            arm.forward_kinematics()
+    return run
+
+def setup_fk_batch(size):
+    from kinematics import ForearmKinematics
+
+    angles = _random_angles(size)
+    arm = ForearmKinematics([(1.0, 0, 0, 0.0), (1.0, 0, 0, 0.0)])
+    return lambda: arm.forward_kinematics_batch(angles)
+
+def setup_ik_target(size):
+    from kinematics import inverse_kinematics_2d
+
+    targets = _random_targets(size).tolist()
+
+    def run():
+        for x, y in targets:
+            inverse_kinematics_2d(x, y, 1.0, 1.0)
+    return run
+
+def setup_ik_batch(size):
+    from kinematics import inverse_kinematics_2d_batch
+
+    targets = _random_targets(size)
+    return lambda: inverse_kinematics_2d_batch(targets, 1.0, 1.0)
+
+def setup_pid_step(size):
+    from control.pid_controller import PIDController
+
+    pid = PIDController(10.0, 1.0, 0.5, 0.001)
+    measured = np.sin(np.linspace(0.0, 10.0, size)).tolist()
+
+    def run():
+        for value in measured:
+            pid.compute(1.0, value)
+    return run
+
+def setup_batch_pid_step(size):
+    from control.pid_controller import BatchPIDController
+
+    pid = BatchPIDController(10.0, 1.0, 0.5, 0.001, shape=(size,))
+    measured = np.random.default_rng(0).uniform(-1.0, 1.0, size)
+    return lambda: pid.compute(1.0, measured)
+
+def setup_simulation(size):
+    from control.simulation_engine import run_simulation
+
+    setpoints = np.linspace(0.5, 1.5, size)
+    return lambda: run_simulation(setpoints, duration=2.0, dt=0.01)
+
+def setup_actuation_target(size):
+    from actuation.actuation_optimizer import optimize_actuation
+
+    targets = np.linspace(0.1, 3.0, size)
+
+    def run():
+        for target in targets:
+            optimize_actuation(target, (1.0, 0.5))
+    return run
+
+def _setup_plot_update(cls, size):
+    angles = _random_angles(size, seed=1)
+    plot = cls()
+    plot.update(0.0, 0.0, 120.0)  # first full draw: fixes the background for blitting
+
+    def run():
+        for theta1, theta2 in angles:
+            plot.update(theta1, theta2, 120.0)
+    return run
+
+def setup_plot_2d_update(size):
+    from visualization.arm_plotter import ArmPlot2D
+    return _setup_plot_update(ArmPlot2D, size)
+
+def setup_plot_3d_update(size):
+    from visualization.arm_plotter_3d import ArmPlot3D
+    return _setup_plot_update(ArmPlot3D, size)
+
+BENCHMARKS = (
+    Benchmark("fk_pose", setup_fk_pose, (1, 100, 1000), "pose"),
+    Benchmark("fk_batch", setup_fk_batch, (1, 100, 10_000, 100_000), "pose"),
+    Benchmark("ik_target", setup_ik_target, (1, 100, 1000), "target"),
+    Benchmark("ik_batch", setup_ik_batch, (1, 100, 10_000, 100_000), "target"),
+    Benchmark("pid_step", setup_pid_step, (1, 100, 1000), "step"),
+    Benchmark("batch_pid_step", setup_batch_pid_step, (1, 100, 10_000), "arm"),
+    Benchmark("simulation", setup_simulation, (1, 100, 1000), "arm"),
+    Benchmark("actuation_target", setup_actuation_target, (1, 10, 100), "target"),
+    Benchmark("plot_2d_update", setup_plot_2d_update, (1, 20), "frame"),
+    Benchmark("plot_3d_update", setup_plot_3d_update, (1, 20), "frame"),
+)
+
+def case_key(name, size):
+    return f"{name}[{size}]"
+
+def time_case(fn, min_time=0.2, min_repeats=5, max_repeats=1000):
+    """Call fn once to warm up, then repeatedly until min_time has elapsed. Returns the timings."""
+    fn()
+    timings = []
+    deadline = time.perf_counter() + min_time
+    while len(timings) < max_repeats and (len(timings) < min_repeats or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return np.asarray(timings)
+
+def run_benchmarks(benchmarks=BENCHMARKS, sizes=None, name_filter=None, min_time=0.2, log=None):
+    """Run every (benchmark, size) case and return a list of BenchmarkResult."""
+    results = []
+    for bench in benchmarks:
+        if name_filter and not any(part in bench.name for part in name_filter):
+            continue
+        for size in (sizes or bench.sizes):
+            timings = time_case(bench.setup(size), min_time=min_time)
+            best = float(timings.min())
+            result = BenchmarkResult(bench.name, size, len(timings), best, float(np.median(timings)),
+                                     best / size, size / best, bench.unit)
+            results.append(result)
+            if log:
+                log(result)
+    return results
+
+def _calibration_workload():
+    matrices = np.random.default_rng(0).uniform(size=(200, 4, 4))
+    total = 0.0
+    for _ in range(20):
+        matrices @ matrices
+        for i in range(2000):
+            total += i * 0.5
+    return total
+
+def calibrate(min_time=0.2):
+    """Best time of a fixed numpy + interpreter workload, used to normalize across machines and runs."""
+    return float(time_case(_calibration_workload, min_time=min_time, min_repeats=20).min())
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+def results_to_json(results, calibration=None):
+    return {
+        "environment": environment(),
+        "calibration": calibration,
+        "results": {case_key(r.name, r.size): r._asdict() for r in results},
+    }
+
+def save_results(path, results, calibration=None):
+    with open(path, "w") as f:
+        json.dump(results_to_json(results, calibration), f, indent=2)
+        f.write("\n")
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+def compare(results, baseline, threshold=0.5, calibration=None):
+    """
+    Compare per-item latency with a baseline (the dict stored in the JSON file).
+    When both runs carry a calibration time, latencies are divided by it first so a
+    slower or throttled machine does not show up as a regression.
+    Returns a list of (key, ratio, regressed) for the cases present in both.
+    """
+    scale = 1.0
+    if calibration and baseline.get("calibration"):
+        scale = baseline["calibration"] / calibration
+    report = []
+    for r in results:
+        key = case_key(r.name, r.size)
+        if key not in baseline["results"]:
+            continue
+        ratio = scale * r.per_item / baseline["results"][key]["per_item"]
+        report.append((key, ratio, ratio > 1.0 + threshold))
+    return report
+
+def _format_time(seconds):
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:7.2f} {unit}"
+    return f"{seconds / 1e-9:7.1f} ns"
+
+def _print_result(r):
+    print(f"{case_key(r.name, r.size):26s} call {_format_time(r.best)}   "
+          f"per {r.unit:6s} {_format_time(r.per_item)}   {r.throughput:14,.0f} {r.unit}/s")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the simulator hot paths.")
+    parser.add_argument("--filter", nargs="+", help="Only run benchmarks whose name contains one of these.")
+    parser.add_argument("--sizes", nargs="+", type=int, help="Override the batch sizes of every benchmark.")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum timing budget per case, in seconds.")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON to compare against.")
+    parser.add_argument("--update-baseline", action="store_true", help="Overwrite the baseline with this run.")
+    parser.add_argument("--threshold", type=float, default=0.5,
+                        help="Allowed slowdown per item before a case counts as a regression (default 0.5).")
+    parser.add_argument("--no-calibrate", action="store_true",
+                        help="Compare raw timings instead of normalizing by the calibration workload.")
+    args = parser.parse_args(argv)
+
+    calibration = None if args.no_calibrate else calibrate()
+    results = run_benchmarks(sizes=args.sizes, name_filter=args.filter, min_time=args.min_time,
+                             log=_print_result)
+    if calibration is not None:
+        calibration = min(calibration, calibrate())
+    regressions = []
+    if args.update_baseline:
+        save_results(args.baseline, results, calibration)
+        print(f"Baseline written to {args.baseline}")
+    elif not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+    else:
+        baseline = load_results(args.baseline)
+        report = compare(results, baseline, args.threshold, calibration)
+        flagged = {key for key, _, regressed in report if regressed}
+        if flagged:
+            # A burst of noise must not fail the run: flagged cases are repeated and the best run is kept
+            print(f"Re-running {len(flagged)} flagged case(s)")
+            by_name = {bench.name: bench for bench in BENCHMARKS}
+            for i, r in enumerate(results):
+                if case_key(r.name, r.size) in flagged:
+                    retry = run_benchmarks([by_name[r.name]], sizes=[r.size], min_time=args.min_time)[0]
+                    if retry.best < r.best:
+                        results[i] = retry
+            report = compare(results, baseline, args.threshold, calibration)
+        regressions = [(key, ratio) for key, ratio, regressed in report if regressed]
+        print(f"\nCompared {len(report)} cases with {args.baseline}")
+        for key, ratio in regressions:
+            print(f"Regression: {key} is {ratio:.2f}x slower per item than the baseline", file=sys.stderr)
+
+    if args.output:
+        save_results(args.output, results, calibration)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
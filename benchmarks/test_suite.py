@@ -0,0 +1,21 @@
+from benchmarks.suite import BENCHMARKS, case_key, compare, load_results, run_benchmarks, save_results
+
+def test_run_and_compare_against_baseline(tmp_path):
+    selected = [bench for bench in BENCHMARKS if bench.name in ("fk_batch", "pid_step")]
+    results = run_benchmarks(selected, sizes=[1, 50], min_time=0.01)
+    assert [case_key(r.name, r.size) for r in results] == ["fk_batch[1]", "fk_batch[50]",
+                                                           "pid_step[1]", "pid_step[50]"]
+    assert all(r.best > 0 and abs(r.throughput * r.per_item - 1.0) < 1e-9 for r in results)
+
+    path = tmp_path / "baseline.json"
+    save_results(path, results, calibration=1e-3)
+    baseline = load_results(path)
+    assert not any(regressed for _, _, regressed in compare(results, baseline, calibration=1e-3))
+
+    # El mismo tiempo en una máquina el doble de rápida es una regresión
+    report = compare(results, baseline, threshold=0.5, calibration=0.5e-3)
+    assert all(regressed and abs(ratio - 2.0) < 1e-9 for _, ratio, regressed in report)
+
+    baseline["results"]["fk_batch[1]"]["per_item"] /= 3.0
+    report = dict((key, regressed) for key, _, regressed in compare(results, baseline, calibration=1e-3))
+    assert report == {"fk_batch[1]": True, "fk_batch[50]": False, "pid_step[1]": False, "pid_step[50]": False}
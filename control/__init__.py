@@ -0,0 +1,4 @@
+from control.pid_controller import PIDController, BatchPIDController
+from control.simulation_engine import run_simulation
+from control.realtime import RealtimeRunner, SimulatedJointPlant
+from control.time_scaling import TimedTrajectory, point_to_point, smooth_path, time_scale_path
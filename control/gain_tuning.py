@@ -0,0 +1,161 @@
+from collections import namedtuple
+import hashlib
+import os
+import numpy as np
+from control.simulation_engine import run_simulation
+
+METRICS = ("rise_time", "overshoot", "settling_time", "iae", "itae")
+
+GainSweepResult = namedtuple("GainSweepResult", ("gains",) + METRICS + ("rank",))
+
+def gain_grid(Kp_values, Ki_values, Kd_values):
+    """All (Kp, Ki, Kd) combinations as an (N, 3) array."""
+    return np.stack(np.meshgrid(Kp_values, Ki_values, Kd_values, indexing="ij"), axis=-1).reshape(-1, 3)
+
+def random_gains(n, Kp_range=(0.0, 50.0), Ki_range=(0.0, 10.0), Kd_range=(0.0, 10.0), seed=None):
+    """n uniformly sampled (Kp, Ki, Kd) triples as an (n, 3) array."""
+    low, high = np.array([Kp_range, Ki_range, Kd_range], dtype=float).T
+    return np.random.default_rng(seed).uniform(low, high, (n, 3))
+
+def step_response_metrics(time, position, setpoint, settle_band=0.02):
+    """
+    Step-response metrics for each column of position, shape (n_steps, N).
+
+    rise_time is the 10 %-90 % rise, overshoot is in percent of the setpoint,
+    settling_time is when the response last enters the +-settle_band band.
+    Responses that never rise or settle get inf. iae and itae integrate the
+    absolute error (weighted by time for itae). The metrics are relative to
+    the step, so setpoint must not be 0.
+    """
+    if setpoint == 0:
+        raise ValueError("step-response metrics need a non-zero setpoint")
+    dt = time[1] - time[0]
+    with np.errstate(over="ignore", invalid="ignore"):
+        y = position / setpoint
+        error = np.abs(setpoint - position)
+
+        def first_crossing(level):
+            reached = y >= level
+            index = reached.argmax(axis=0)
+            return np.where(reached.any(axis=0), time[index], np.inf)
+
+        rise_time = first_crossing(0.9) - first_crossing(0.1)
+        overshoot = np.maximum(np.nanmax(y, axis=0) - 1, 0) * 100
+
+        outside = ~(np.abs(y - 1) <= settle_band)
+        last_outside = len(time) - 1 - outside[::-1].argmax(axis=0)
+        settling_time = np.where(~outside.any(axis=0), time[0],
+                                 np.where(outside[-1], np.inf, time[np.minimum(last_outside + 1, len(time) - 1)]))
+
+        iae = error.sum(axis=0) * dt
+        itae = (time[:, np.newaxis] * error).sum(axis=0) * dt
+
+    metrics = np.stack([rise_time, overshoot, settling_time, iae, itae], axis=1)
+    return np.where(np.isfinite(metrics), metrics, np.inf)
+
+def pareto_ranks(objectives):
+    """
+    Non-dominated sorting rank of every row of objectives (lower is better).
+
+    Rank 0 is the Pareto front, rank 1 the front once rank 0 is removed, etc.
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    ranks = np.full(len(objectives), -1)
+
+    def domination_count(rows):
+        # for every point, how many of `rows` dominate it, in bounded-memory blocks
+        count = np.zeros(len(objectives), dtype=int)
+        for start in range(0, len(rows), 256):
+            this = objectives[rows[start:start + 256]]
+            no_worse = np.ones((len(this), len(objectives)), dtype=bool)
+            better = np.zeros((len(this), len(objectives)), dtype=bool)
+            for k in range(objectives.shape[1]):
+                no_worse &= this[:, k, np.newaxis] <= objectives[:, k]
+                better |= this[:, k, np.newaxis] < objectives[:, k]
+            count += (no_worse & better).sum(axis=0)
+        return count
+
+    # Deb's fast non-dominated sort: each point is compared against each front once
+    count = domination_count(np.arange(len(objectives)))
+    front = np.flatnonzero(count == 0)
+    rank = 0
+    while len(front):
+        ranks[front] = rank
+        count -= domination_count(front)
+        count[ranks >= 0] = -1
+        front = np.flatnonzero(count == 0)
+        rank += 1
+    return ranks
+
+def _evaluate_chunk(gains, plant):
+    setpoint, duration, dt, damping, integrator, settle_band = plant
+    result = run_simulation(setpoint, Kp=gains[:, 0], Ki=gains[:, 1], Kd=gains[:, 2],
+                            duration=duration, dt=dt, damping=damping, integrator=integrator)
+    return step_response_metrics(result.time, result.position, setpoint, settle_band)
+
+def _cache_path(cache_dir, plant):
+    key = hashlib.sha1(repr(plant).encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"gains-{key}.npz")
+
+def sweep_gains(gains, setpoint=1.0, duration=2.0, dt=0.01, damping=0.1, integrator="euler",
+                settle_band=0.02, objectives=("overshoot", "settling_time", "itae"),
+                workers=None, chunk_size=256, cache_dir=None):
+    """
+    Evaluate step-response metrics for every (Kp, Ki, Kd) row of gains.
+
+    Points are simulated in vectorized chunks spread over a process pool of
+    `workers` processes (all cores by default, in-process when 1). With
+    cache_dir, results are stored per plant configuration and keyed by the
+    gains, so repeated sweeps only simulate new points.
+
+    Returns a GainSweepResult with one entry per gain row; `rank` is the
+    Pareto rank over `objectives` (0 is the front, see pareto_front).
+    """
+    if setpoint == 0:
+        raise ValueError("step-response metrics need a non-zero setpoint")
+    gains = np.asarray(gains, dtype=float).reshape(-1, 3)
+    plant = (float(setpoint), float(duration), float(dt), float(damping), integrator, float(settle_band))
+    metrics = np.empty((len(gains), len(METRICS)))
+
+    cached = {}
+    path = _cache_path(cache_dir, plant) if cache_dir else None
+    if path and os.path.exists(path):
+        with np.load(path) as data:
+            cached = {row.tobytes(): values for row, values in zip(data["gains"], data["metrics"])}
+
+    missing = []
+    for i, row in enumerate(gains):
+        values = cached.get(row.tobytes())
+        if values is None:
+            missing.append(i)
+        else:
+            metrics[i] = values
+
+    if missing:
+        todo = gains[missing]
+        chunks = [todo[start:start + chunk_size] for start in range(0, len(todo), chunk_size)]
+        workers = workers or os.cpu_count()
+        if workers == 1 or len(chunks) == 1:
+            results = [_evaluate_chunk(chunk, plant) for chunk in chunks]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_evaluate_chunk, chunks, [plant] * len(chunks)))
+        metrics[missing] = np.concatenate(results)
+
+        if path:
+            cached.update((row.tobytes(), values) for row, values in zip(todo, metrics[missing]))
+            os.makedirs(cache_dir, exist_ok=True)
+            all_gains = np.array([np.frombuffer(key) for key in cached])
+            tmp = path + ".tmp.npz"
+            np.savez(tmp, gains=all_gains, metrics=np.array(list(cached.values())))
+            os.replace(tmp, path)
+
+    ranks = pareto_ranks(metrics[:, [METRICS.index(name) for name in objectives]])
+    return GainSweepResult(gains, *metrics.T, ranks)
+
+def pareto_front(result, sort_by="itae"):
+    """Indices of the Pareto-optimal gains of a sweep, best `sort_by` first."""
+    front = np.flatnonzero(result.rank == 0)
+    return front[np.argsort(getattr(result, sort_by)[front], kind="stable")]
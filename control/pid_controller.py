@@ -1,3 +1,5 @@
+import numpy as np
+
 class PIDController:
     def __init__(self, Kp, Ki, Kd, dt):
         self.Kp = Kp
@@ -14,3 +16,68 @@ class PIDController:
         output = self.Kp * error + self.Ki * self.integral + self.Kd * derivative
         self.prev_error = error
         return output
+
+
+class BatchPIDController:
+    def __init__(self, Kp, Ki, Kd, dt, shape=None, integral_limit=None, output_limit=None,
+                 derivative_on_measurement=False):
+        """
+        Lock-step PID for many arms and joints, state shaped (n_arms, n_joints).
+
+        Gains and limits broadcast against `shape` (defaults to the gains' own
+        broadcast shape). With the default options each element behaves exactly
+        like PIDController. integral_limit clamps the integral term's state,
+        output_limit saturates the output and stops integrating while saturated
+        (anti-windup). derivative_on_measurement differentiates the measurement
+        instead of the error to avoid derivative kick on setpoint changes.
+        """
+        if shape is None:
+            shape = np.broadcast_shapes(np.shape(Kp), np.shape(Ki), np.shape(Kd))
+        self.shape = tuple(shape)
+        self.Kp = np.broadcast_to(np.asarray(Kp, dtype=float), self.shape)
+        self.Ki = np.broadcast_to(np.asarray(Ki, dtype=float), self.shape)
+        self.Kd = np.broadcast_to(np.asarray(Kd, dtype=float), self.shape)
+        self.dt = dt
+        self.integral_limit = integral_limit
+        self.output_limit = output_limit
+        self.derivative_on_measurement = derivative_on_measurement
+        self.integral = np.zeros(self.shape)
+        self.prev_error = np.zeros(self.shape)
+        self.prev_measured = np.zeros(self.shape)
+        self.primed = np.zeros(self.shape, dtype=bool)
+
+    def compute(self, setpoint, measured_value):
+        measured_value = np.broadcast_to(np.asarray(measured_value, dtype=float), self.shape)
+        error = setpoint - measured_value
+        integral = self.integral + error * self.dt
+        if self.integral_limit is not None:
+            integral = np.clip(integral, -self.integral_limit, self.integral_limit)
+
+        if self.derivative_on_measurement:
+            # no history yet on the first step after a reset: no derivative term
+            previous = np.where(self.primed, self.prev_measured, measured_value)
+            derivative = -(measured_value - previous) / self.dt
+        else:
+            derivative = (error - self.prev_error) / self.dt
+
+        output = self.Kp * error + self.Ki * integral + self.Kd * derivative
+        if self.output_limit is not None:
+            clipped = np.clip(output, -self.output_limit, self.output_limit)
+            winding_up = (clipped != output) & (np.sign(error) == np.sign(output))
+            integral = np.where(winding_up, self.integral, integral)
+            output = clipped
+
+        self.integral = integral
+        self.prev_error = error
+        self.prev_measured = np.array(measured_value)
+        self.primed[...] = True
+        return output
+
+    def reset(self, arms=None):
+        """Clear the state of the selected arms (index, slice or mask); all if None."""
+        if arms is None:
+            arms = slice(None)
+        self.integral[arms] = 0
+        self.prev_error[arms] = 0
+        self.prev_measured[arms] = 0
+        self.primed[arms] = False
@@ -0,0 +1,234 @@
+import bisect
+import gc
+import threading
+import time
+from collections import namedtuple
+import numpy as np
+
+RealtimeStats = namedtuple("RealtimeStats", ["ticks", "missed_deadlines", "skipped_ticks", "elapsed",
+                                             "compute_mean", "compute_max", "compute_p99",
+                                             "jitter_mean", "jitter_max", "jitter_p99",
+                                             "histogram_edges", "histogram_counts"])
+
+class SimulatedJointPlant:
+    def __init__(self, damping=0.1, position=0.0, velocity=0.0):
+        """Local stand-in for a joint: the damped second-order model used by run_simulation."""
+        self.damping = damping
+        self.position = position
+        self.velocity = velocity
+
+    def measure(self):
+        return self.position
+
+    def actuate(self, control_signal, dt):
+        """Hold control_signal for dt seconds (semi-implicit Euler, as run_simulation)."""
+        acceleration = control_signal - self.damping * self.velocity
+        self.velocity = self.velocity + acceleration * dt
+        self.position = self.position + self.velocity * dt
+
+class TickLog:
+    FIELDS = ("release", "jitter", "compute", "setpoint", "measured", "control")
+
+    def __init__(self, capacity):
+        """Preallocated ring buffer holding the last `capacity` ticks; nothing is allocated per tick."""
+        self.capacity = capacity
+        self.data = np.zeros((len(self.FIELDS), capacity))
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def append(self, release, jitter, compute, setpoint, measured, control):
+        with self.lock:
+            i = self.count % self.capacity
+            data = self.data
+            data[0, i] = release
+            data[1, i] = jitter
+            data[2, i] = compute
+            data[3, i] = setpoint
+            data[4, i] = measured
+            data[5, i] = control
+            self.count += 1
+
+    def clear(self):
+        with self.lock:
+            self.count = 0
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def recent(self):
+        """Copy of the buffered ticks, oldest first, as a dict of arrays keyed by FIELDS."""
+        with self.lock:
+            # copied under the lock so a tick appended meanwhile cannot tear the snapshot
+            n = len(self)
+            order = (np.arange(self.count - n, self.count)) % self.capacity
+            data = self.data[:, order]
+        return {name: data[j] for j, name in enumerate(self.FIELDS)}
+
+class RealtimeRunner:
+    def __init__(self, controller, plant, setpoint=0.0, rate=None, buffer_size=10000, jitter_edges=None,
+                 spin_margin=200e-6, disable_gc=False, gc_slack=2e-3, clock=time.perf_counter,
+                 sleep=time.sleep):
+        """
+        Step `controller` (PIDController-like, compute(setpoint, measured)) against
+        `plant` (measure() and actuate(control_signal, dt)) at a fixed rate.
+
+        Releases are scheduled on absolute times of the monotonic `clock`, so they
+        do not drift. The runner sleeps until spin_margin before each release and
+        busy-waits the rest. The rate defaults to 1 / controller.dt; a different
+        rate is rejected because the PID gains assume that step.
+
+        setpoint may be a number or a function of the elapsed time, and can be
+        changed while running. Per-tick timings go into a TickLog ring buffer of
+        buffer_size ticks. Release jitter (start time minus release time) is also
+        counted in a histogram whose bins start at jitter_edges (the last bin is
+        open-ended; defaults to 20 bins over one period).
+
+        disable_gc (opt-in) keeps the automatic garbage collector out of the loop,
+        which otherwise can pause a tick. It is process-wide, so the objects that
+        exist at start are frozen and young objects are collected in the slack
+        before a release when more than gc_slack seconds are left; the previous
+        collector state is restored when run() returns.
+        """
+        if rate is None:
+            rate = 1.0 / controller.dt
+        elif abs(rate * controller.dt - 1.0) > 1e-9:
+            raise ValueError(f"rate {rate} Hz does not match controller.dt = {controller.dt} s")
+        self.controller = controller
+        self.plant = plant
+        self.setpoint = setpoint
+        self.rate = rate
+        self.period = 1.0 / rate
+        self.spin_margin = spin_margin
+        self.disable_gc = disable_gc
+        self.gc_slack = gc_slack
+        self.clock = clock
+        self.sleep = sleep
+        if jitter_edges is None:
+            jitter_edges = np.linspace(0.0, self.period, 21)[:-1]
+        self.jitter_edges = [float(edge) for edge in jitter_edges]
+        self.log = TickLog(buffer_size)
+        self._stop = threading.Event()
+        self._thread = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.log.clear()
+        self.ticks = 0
+        self.missed_deadlines = 0
+        self.skipped_ticks = 0
+        self.compute_total = 0.0
+        self.compute_max = 0.0
+        self.jitter_total = 0.0
+        self.jitter_max = 0.0
+        self.jitter_counts = [0] * len(self.jitter_edges)
+        self.started_at = None
+        self.last_tick_at = None
+
+    def _wait_until(self, target):
+        remaining = target - self.clock()
+        if self.disable_gc and remaining > self.gc_slack:
+            gc.collect(0)
+            remaining = target - self.clock()
+        if remaining > self.spin_margin:
+            self.sleep(remaining - self.spin_margin)
+        while self.clock() < target:
+            pass
+
+    def run(self, duration=None, ticks=None):
+        """Run in the calling thread until `duration` seconds, `ticks` ticks or stop()."""
+        clock, period = self.clock, self.period
+        controller, plant, log = self.controller, self.plant, self.log
+        edges, counts = self.jitter_edges, self.jitter_counts
+        gc_was_enabled = gc.isenabled()
+        if self.disable_gc:
+            # a collector pause in the middle of the loop is a missed deadline
+            gc.freeze()
+            gc.disable()
+        try:
+            start = clock()
+            self.started_at = start
+            slot = last_slot = 0
+            n_ticks = 0
+            held = 0.0
+            while not self._stop.is_set():
+                if (ticks is not None and n_ticks >= ticks) or (duration is not None and slot * period >= duration):
+                    break
+                release = start + slot * period
+                self._wait_until(release)
+
+                begin = clock()
+                setpoint = self.setpoint
+                if callable(setpoint):
+                    setpoint = setpoint(release - start)
+                # Skipped slots keep the previous signal, as the actuator would
+                for _ in range(slot - last_slot - 1):
+                    plant.actuate(held, period)
+                measured = plant.measure()
+                control_signal = controller.compute(setpoint, measured)
+                plant.actuate(control_signal, period)
+                held = control_signal
+                end = clock()
+
+                jitter = begin - release
+                compute = end - begin
+                log.append(release - start, jitter, compute, setpoint, measured, control_signal)
+                n_ticks += 1
+                self.ticks += 1
+                self.compute_total += compute
+                self.jitter_total += jitter
+                if compute > self.compute_max:
+                    self.compute_max = compute
+                if jitter > self.jitter_max:
+                    self.jitter_max = jitter
+                counts[max(bisect.bisect_right(edges, jitter) - 1, 0)] += 1
+                if end > release + period:
+                    self.missed_deadlines += 1
+                self.last_tick_at = end
+
+                last_slot = slot
+                slot += 1
+                # Overrun: releases that are already a full period in the past are skipped, not bunched
+                behind = int((end - start) / period) - slot
+                if behind > 0:
+                    slot += behind
+                    self.skipped_ticks += behind
+        finally:
+            if self.disable_gc:
+                gc.unfreeze()
+                if gc_was_enabled:
+                    gc.enable()
+        return self.stats()
+
+    def start(self, duration=None, ticks=None):
+        """Run in a background thread; read stats() live and stop() when done."""
+        if self.running:
+            raise RuntimeError("runner already started")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, kwargs={"duration": duration, "ticks": ticks},
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def stats(self):
+        """Snapshot of the timing statistics; safe to call from another thread while running."""
+        ticks = self.ticks
+        recent = self.log.recent()
+        if len(recent["compute"]):
+            compute_p99 = float(np.percentile(recent["compute"], 99))
+            jitter_p99 = float(np.percentile(recent["jitter"], 99))
+        else:
+            compute_p99 = jitter_p99 = 0.0
+        elapsed = 0.0 if self.started_at is None else self.last_tick_at - self.started_at
+        return RealtimeStats(ticks, self.missed_deadlines, self.skipped_ticks, elapsed,
+                             self.compute_total / ticks if ticks else 0.0, self.compute_max, compute_p99,
+                             self.jitter_total / ticks if ticks else 0.0, self.jitter_max, jitter_p99,
+                             np.array(self.jitter_edges), np.array(self.jitter_counts))
@@ -0,0 +1,74 @@
+from collections import namedtuple
+import numpy as np
+from control.pid_controller import BatchPIDController
+
+SimulationResult = namedtuple("SimulationResult", ["time", "position", "velocity", "effort"])
+
+INTEGRATORS = ("euler", "rk4")
+
+def _plant_derivative(velocity, control_signal, damping):
+    # Simple second-order system: torque affects acceleration
+    return control_signal - damping * velocity
+
+def run_simulation(setpoint, Kp=10.0, Ki=1.0, Kd=0.5, duration=2.0, dt=0.01, damping=0.1,
+                   integrator="euler", initial_position=0.0, initial_velocity=0.0, reference=None):
+    """
+    Headless closed-loop joint simulation, vectorized over a batch of runs.
+
+    setpoint, gains, damping and initial state broadcast to a common batch
+    shape, so one call can sweep setpoints or gain sets. The control signal is
+    held constant over each step and the plant is integrated with
+    semi-implicit Euler ("euler", as in simulate_joint_motion) or classic
+    Runge-Kutta ("rk4").
+
+    reference: optional time-varying setpoint of shape (n_steps,) + batch
+    shape, e.g. the position of a TimedTrajectory sampled at 1 / dt. It
+    replaces `setpoint` and sets the number of steps (duration is ignored).
+
+    Returns a SimulationResult whose position, velocity and effort arrays have
+    shape (n_steps,) + batch_shape.
+    """
+    if integrator not in INTEGRATORS:
+        raise ValueError(f"Unknown integrator {integrator!r}, expected one of {INTEGRATORS}")
+
+    if reference is not None:
+        reference = np.asarray(reference, dtype=float)
+        setpoint = reference[0]
+        time = np.arange(len(reference)) * dt
+    else:
+        time = np.arange(0, duration, dt)
+    shape = np.broadcast_shapes(np.shape(setpoint), np.shape(Kp), np.shape(Ki), np.shape(Kd),
+                                np.shape(damping), np.shape(initial_position),
+                                np.shape(initial_velocity))
+    controller = BatchPIDController(Kp, Ki, Kd, dt, shape=shape)
+    setpoint = np.broadcast_to(np.asarray(setpoint, dtype=float), shape)
+
+    positions = np.empty((len(time),) + shape)
+    velocities = np.empty((len(time),) + shape)
+    efforts = np.empty((len(time),) + shape)
+    position = np.array(np.broadcast_to(initial_position, shape), dtype=float)
+    velocity = np.array(np.broadcast_to(initial_velocity, shape), dtype=float)
+
+    for k in range(len(time)):
+        if reference is not None:
+            setpoint = reference[k]
+        control_signal = controller.compute(setpoint, position)
+        if integrator == "euler":
+            acceleration = _plant_derivative(velocity, control_signal, damping)
+            velocity = velocity + acceleration * dt
+            position = position + velocity * dt
+        else:
+            k1_x, k1_v = velocity, _plant_derivative(velocity, control_signal, damping)
+            v2 = velocity + 0.5 * dt * k1_v
+            k2_x, k2_v = v2, _plant_derivative(v2, control_signal, damping)
+            v3 = velocity + 0.5 * dt * k2_v
+            k3_x, k3_v = v3, _plant_derivative(v3, control_signal, damping)
+            v4 = velocity + dt * k3_v
+            k4_x, k4_v = v4, _plant_derivative(v4, control_signal, damping)
+            position = position + dt / 6 * (k1_x + 2 * k2_x + 2 * k3_x + k4_x)
+            velocity = velocity + dt / 6 * (k1_v + 2 * k2_v + 2 * k3_v + k4_v)
+        positions[k] = position
+        velocities[k] = velocity
+        efforts[k] = control_signal
+
+    return SimulationResult(time, positions, velocities, efforts)
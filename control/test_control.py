@@ -1,6 +1,207 @@
-from pid_controller import PIDController
+from control.pid_controller import PIDController
 
 def test_pid_response():
     pid = PIDController(1.0, 0.1, 0.05, 0.1)
     output = pid.compute(1.0, 0.5)
     assert isinstance(output, float)
+
+def test_batch_pid_matches_scalar():
+    import numpy as np
+    from control.pid_controller import BatchPIDController
+
+    rng = np.random.default_rng(0)
+    Kp, Ki, Kd = rng.uniform(0.5, 10, (3, 4, 2))
+    batch = BatchPIDController(Kp, Ki, Kd, 0.01)
+    scalars = [[PIDController(Kp[i, j], Ki[i, j], Kd[i, j], 0.01) for j in range(2)] for i in range(4)]
+    for _ in range(20):
+        setpoint, measured = rng.normal(size=(2, 4, 2))
+        output = batch.compute(setpoint, measured)
+        expected = [[scalars[i][j].compute(setpoint[i, j], measured[i, j]) for j in range(2)] for i in range(4)]
+        assert np.array_equal(output, expected)
+
+def test_batch_pid_anti_windup_and_reset():
+    import numpy as np
+    from control.pid_controller import BatchPIDController
+
+    pid = BatchPIDController(1.0, 5.0, 0.0, 0.1, shape=(3, 2), output_limit=2.0)
+    for _ in range(100):
+        output = pid.compute(10.0, 0.0)
+    assert np.all(output == 2.0)
+    assert np.all(pid.integral == 0)
+    pid.compute(0.1, 0.0)
+    pid.reset([0, 2])
+    assert np.all(pid.integral[[0, 2]] == 0) and np.all(pid.integral[1] > 0)
+
+def test_simulation_engine_matches_reference_loop():
+    import numpy as np
+    from control.simulation_engine import run_simulation
+
+    controller = PIDController(Kp=10.0, Ki=1.0, Kd=0.5, dt=0.01)
+    position = velocity = 0.0
+    positions = []
+    for _ in np.arange(0, 2.0, 0.01):
+        control_signal = controller.compute(1.0, position)
+        velocity += (control_signal - 0.1 * velocity) * 0.01
+        position += velocity * 0.01
+        positions.append(position)
+    assert np.array_equal(run_simulation(1.0).position, positions)
+
+def test_simulation_engine_batch_of_gains():
+    import numpy as np
+    from control.simulation_engine import run_simulation
+
+    Kp = np.array([5.0, 10.0, 20.0])
+    batch = run_simulation(1.0, Kp=Kp, integrator="rk4", duration=20.0)
+    assert batch.position.shape == (2000, 3)
+    for i, gain in enumerate(Kp):
+        assert np.array_equal(batch.position[:, i], run_simulation(1.0, Kp=gain, integrator="rk4", duration=20.0).position)
+    assert np.allclose(batch.position[-1], 1.0, atol=0.05)
+
+def test_gain_sweep_cache_pool_and_pareto(tmp_path):
+    import numpy as np
+    from control.gain_tuning import gain_grid, sweep_gains, pareto_front, METRICS
+
+    gains = gain_grid([2.0, 10.0, 30.0], [0.0, 1.0], [0.5, 4.0])
+    serial = sweep_gains(gains, workers=1, cache_dir=str(tmp_path))
+    pooled = sweep_gains(gains, workers=2, chunk_size=4)
+    cached = sweep_gains(gains[::-1], workers=1, cache_dir=str(tmp_path))
+    for name in METRICS:
+        assert np.array_equal(getattr(serial, name), getattr(pooled, name))
+        assert np.array_equal(getattr(serial, name), getattr(cached, name)[::-1])
+
+    front = pareto_front(serial)
+    assert len(front) and np.all(serial.rank[front] == 0)
+    assert np.all(np.diff(serial.itae[front]) >= 0)
+
+    import pytest
+    with pytest.raises(ValueError, match="non-zero setpoint"):
+        sweep_gains(gains, setpoint=0.0, workers=1)
+
+class _FakeClock:
+    def __init__(self, tick=1e-6):
+        self.now = 0.0
+        self.tick = tick
+
+    def __call__(self):
+        self.now += self.tick
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+def test_realtime_runner_tracks_simulation_and_overruns():
+    import numpy as np
+    from control.realtime import RealtimeRunner, SimulatedJointPlant
+    from control.simulation_engine import run_simulation
+
+    clock = _FakeClock()
+    runner = RealtimeRunner(PIDController(10.0, 1.0, 0.5, 0.001), SimulatedJointPlant(), setpoint=1.0,
+                            buffer_size=256, clock=clock, sleep=clock.sleep)
+    stats = runner.run(ticks=500)
+    assert stats.ticks == 500 and stats.missed_deadlines == 0 and stats.skipped_ticks == 0
+    assert stats.histogram_counts.sum() == 500 and stats.jitter_max < 1e-4
+    reference = run_simulation(1.0, dt=0.001, duration=0.5).position
+    log = runner.log.recent()
+    assert len(log["measured"]) == 256
+    assert np.array_equal(log["measured"][1:], reference[-256:-1])
+    assert runner.plant.position == reference[-1]
+
+    applied = []
+    class SlowPlant(SimulatedJointPlant):
+        def actuate(self, control_signal, dt):
+            super().actuate(control_signal, dt)
+            applied.append((control_signal, dt))
+            if runner.ticks == 10 and len(applied) == 11:
+                clock.now += 0.0035  # un tick que tarda 3.5 periodos
+    runner = RealtimeRunner(PIDController(10.0, 1.0, 0.5, 0.001), SlowPlant(), setpoint=1.0,
+                            clock=clock, sleep=clock.sleep)
+    stats = runner.run(duration=0.05)
+    assert stats.missed_deadlines == 1 and stats.skipped_ticks == 2
+    assert stats.ticks + stats.skipped_ticks == 50
+    # the slow tick's signal is held over the two skipped slots, one period at a time
+    assert len(applied) == 50 and all(dt == 0.001 for _, dt in applied)
+    assert applied[11][0] == applied[12][0] == applied[10][0] != applied[13][0]
+
+    import gc
+    states = []
+    class GcProbe(SimulatedJointPlant):
+        def measure(self):
+            states.append(gc.isenabled())
+            return super().measure()
+    for disable_gc in (False, True):
+        RealtimeRunner(PIDController(10.0, 1.0, 0.5, 0.001), GcProbe(), disable_gc=disable_gc,
+                       clock=clock, sleep=clock.sleep).run(ticks=5)
+    assert states == [True] * 5 + [False] * 5
+    assert gc.isenabled() and gc.get_freeze_count() == 0
+
+def test_realtime_runner_live_stats():
+    import time
+    from control.realtime import RealtimeRunner, SimulatedJointPlant
+
+    runner = RealtimeRunner(PIDController(10.0, 1.0, 0.5, 0.001), SimulatedJointPlant(),
+                            setpoint=lambda t: 1.0 if t > 0.05 else 0.0)
+    runner.start(duration=0.3)
+    time.sleep(0.1)
+    live = runner.stats()
+    runner.stop()
+    final = runner.stats()
+    assert 0 < live.ticks <= final.ticks <= 300
+    assert final.compute_mean > 0 and final.histogram_counts.sum() == final.ticks
+    assert not runner.running
+
+def test_point_to_point_profiles():
+    import numpy as np
+    from control.time_scaling import point_to_point
+
+    move = point_to_point([0.0, 0.0], [1.0, -0.5], max_velocity=1.0, max_acceleration=2.0, rate=1000)
+    assert np.isclose(move.time[-1], 1.5) and np.array_equal(move.position[-1], [1.0, -0.5])
+    assert np.allclose(np.abs(move.velocity).max(axis=0), [1.0, 0.5])
+    assert np.abs(move.acceleration).max() <= 2.0
+
+    s_curve = point_to_point(0.0, 1.0, 1.0, 2.0, max_jerk=10.0, rate=1000)
+    assert np.isclose(s_curve.time[-1], 1.7) and s_curve.position[-1, 0] == 1.0
+    jerk = np.diff(s_curve.acceleration[:-1, 0]) * 1000
+    assert np.abs(jerk).max() <= 10.0 + 1e-6 and np.abs(s_curve.acceleration).max() <= 2.0 + 1e-9
+    assert np.allclose(np.gradient(s_curve.position[:, 0], 1e-3)[1:-1], s_curve.velocity[1:-1, 0], atol=1e-5)
+
+def test_path_time_scaling_respects_limits_and_feeds_simulation():
+    import numpy as np
+    from control.simulation_engine import run_simulation
+    from control.time_scaling import smooth_path, time_scale_path
+
+    phi = np.linspace(0, 2 * np.pi, 100_000)
+    path = np.column_stack([0.5 * np.sin(phi), 0.3 * np.sin(2 * phi)])
+    timed = time_scale_path(path, max_velocity=[1.0, 2.0], max_acceleration=3.0, rate=100.0)
+    velocity = np.diff(timed.position, axis=0) * 100
+    acceleration = np.diff(velocity, axis=0) * 100
+    assert np.all(np.abs(velocity).max(axis=0) <= [1.0, 2.0])
+    assert np.abs(acceleration).max() <= 3.0
+    assert np.allclose(timed.position[[0, -1]], path[[0, -1]], atol=1e-12)
+    assert np.all(timed.velocity[[0, -1]] == 0)
+
+    straight = time_scale_path([[0.0, 0.0], [1.0, -0.5]], 1.0, 2.0, rate=1000)
+    assert np.isclose(straight.time[-1], 1.5, atol=2e-3)
+
+    # Waypoints are followed exactly: the corners of the square are not cut
+    square = time_scale_path([[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0]], 1.0, 2.0, rate=100)
+    on_edge = np.isclose(square.position, 0.0, atol=1e-12) | np.isclose(square.position, 1.0, atol=1e-12)
+    assert np.all(on_edge.any(axis=1))
+    assert np.abs(np.diff(square.position, 2, axis=0) * 100 ** 2).max() <= 2.0 + 1e-9
+
+    # Noisy recordings are smoothed on request only; clean paths pass through unchanged
+    assert np.array_equal(smooth_path(path), path)
+    for n in (1000, 100_000):
+        phi = np.linspace(0, 2 * np.pi, n)
+        clean = np.column_stack([0.5 * np.sin(phi), 0.3 * np.sin(2 * phi)])
+        noisy = clean + np.random.default_rng(n).normal(0.0, 1e-4, clean.shape)
+        reference = time_scale_path(clean, max_velocity=[1.0, 2.0], max_acceleration=3.0).time[-1]
+        smoothed = time_scale_path(smooth_path(noisy), max_velocity=[1.0, 2.0], max_acceleration=3.0)
+        assert smoothed.time[-1] < 1.15 * reference
+        assert np.allclose(smoothed.position[[0, -1]], noisy[[0, -1]], atol=1e-12)
+        velocity = np.diff(smoothed.position, axis=0) * 100
+        # sparse waypoints put several corners inside one sample period
+        assert np.abs(np.diff(velocity, axis=0) * 100).max() <= 3.0 * (1.05 if n == 1000 else 1.0) + 1e-9
+
+    tracked = run_simulation(None, Kp=200.0, Ki=10.0, Kd=20.0, dt=0.01, reference=timed.position)
+    assert tracked.position.shape == timed.position.shape
+    assert np.abs(tracked.position - timed.position).max() < 0.05
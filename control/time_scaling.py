@@ -0,0 +1,276 @@
+from collections import namedtuple
+import numpy as np
+
+TimedTrajectory = namedtuple("TimedTrajectory", ["time", "position", "velocity", "acceleration"])
+
+def _phases_trapezoid(length, v_max, a_max):
+    """Durations, start accelerations and jerks of the rest-to-rest trapezoid covering length."""
+    if length * a_max >= v_max ** 2:
+        t_acc, t_cruise = v_max / a_max, length / v_max - v_max / a_max
+    else:
+        t_acc, t_cruise = np.sqrt(length / a_max), 0.0
+    return np.array([t_acc, t_cruise, t_acc]), np.array([a_max, 0.0, -a_max]), np.zeros(3)
+
+def _phases_s_curve(length, v_max, a_max, j_max):
+    """Seven-phase jerk-limited (double S) rest-to-rest profile covering length."""
+    if v_max * j_max < a_max ** 2:
+        t_jerk = np.sqrt(v_max / j_max)
+        t_acc = 2 * t_jerk
+    else:
+        t_jerk = a_max / j_max
+        t_acc = t_jerk + v_max / a_max
+    t_cruise = length / v_max - t_acc
+    if t_cruise < 0:
+        # No cruise phase: the peak velocity stays below v_max
+        t_cruise = 0.0
+        t_jerk = a_max / j_max
+        t_acc = 0.5 * (t_jerk + np.sqrt(t_jerk ** 2 + 4 * length / a_max))
+        if t_acc < 2 * t_jerk:
+            t_jerk = np.cbrt(length / (2 * j_max))
+            t_acc = 2 * t_jerk
+    t_flat = t_acc - 2 * t_jerk
+    durations = np.array([t_jerk, t_flat, t_jerk, t_cruise, t_jerk, t_flat, t_jerk])
+    jerks = np.array([j_max, 0.0, -j_max, 0.0, -j_max, 0.0, j_max])
+    accelerations = np.concatenate([[0.0], np.cumsum(jerks * durations)[:-1]])
+    return durations, accelerations, jerks
+
+def _evaluate_phases(durations, accelerations, jerks, t):
+    """Position, velocity and acceleration of a piecewise-constant-jerk profile starting at rest."""
+    starts = np.concatenate([[0.0], np.cumsum(durations)])
+    p = np.zeros(len(durations) + 1)
+    v = np.zeros(len(durations) + 1)
+    for k, (T, a, j) in enumerate(zip(durations, accelerations, jerks)):
+        v[k + 1] = v[k] + a * T + j * T ** 2 / 2
+        p[k + 1] = p[k] + v[k] * T + a * T ** 2 / 2 + j * T ** 3 / 6
+    k = np.clip(np.searchsorted(starts, t, side="right") - 1, 0, len(durations) - 1)
+    tau = np.clip(t - starts[k], 0.0, durations[k])
+    a, j = accelerations[k], jerks[k]
+    position = p[k] + v[k] * tau + a * tau ** 2 / 2 + j * tau ** 3 / 6
+    velocity = v[k] + a * tau + j * tau ** 2 / 2
+    acceleration = np.where(t < starts[-1], a + j * tau, 0.0)
+    return position, velocity, acceleration
+
+def _control_grid(duration, rate):
+    """Fixed-rate sample times covering [0, duration]; the last one holds the final state."""
+    return np.arange(int(np.ceil(duration * rate - 1e-9)) + 1) / rate
+
+def _per_joint(value, n):
+    return np.broadcast_to(np.asarray(value, dtype=float), (n,))
+
+def point_to_point(start, goal, max_velocity, max_acceleration, max_jerk=None, rate=100.0):
+    """
+    Minimum-time rest-to-rest move from start to goal along the joint-space line.
+
+    All joints share one normalized profile, so they start and stop together
+    and the slowest joint sets the pace. Without max_jerk the profile is
+    trapezoidal (triangular for short moves); with it, a jerk-limited S-curve.
+    Limits are per joint (scalars broadcast) in rad/s, rad/s² and rad/s³.
+
+    Returns a TimedTrajectory sampled at `rate` Hz: time (M,), and position,
+    velocity, acceleration (M, n_joints).
+    """
+    start = np.atleast_1d(np.asarray(start, dtype=float))
+    goal = np.atleast_1d(np.asarray(goal, dtype=float))
+    delta = goal - start
+    n = len(delta)
+    moving = delta != 0
+    if not moving.any():
+        zeros = np.zeros((1, n))
+        return TimedTrajectory(np.zeros(1), start[None, :], zeros, zeros.copy())
+
+    scale = np.abs(delta[moving])
+    v_s = np.min(_per_joint(max_velocity, n)[moving] / scale)
+    a_s = np.min(_per_joint(max_acceleration, n)[moving] / scale)
+    if max_jerk is None:
+        phases = _phases_trapezoid(1.0, v_s, a_s)
+    else:
+        phases = _phases_s_curve(1.0, v_s, a_s, np.min(_per_joint(max_jerk, n)[moving] / scale))
+
+    time = _control_grid(phases[0].sum(), rate)
+    s, s_dot, s_ddot = _evaluate_phases(*phases, time)
+    s = np.where(time >= phases[0].sum(), 1.0, np.minimum(s, 1.0))  # end exactly on goal
+    return TimedTrajectory(time, start + s[:, None] * delta, s_dot[:, None] * delta, s_ddot[:, None] * delta)
+
+def _refine(waypoints, lengths, min_segments):
+    """Split straight segments so the path has at least min_segments (the path itself is unchanged)."""
+    step = lengths.sum() / min_segments
+    pieces = np.maximum(np.ceil(lengths / step), 1).astype(np.int64)
+    owner = np.repeat(np.arange(len(lengths)), pieces)
+    k = np.arange(len(owner)) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+    fraction = (k / pieces[owner])[:, None]
+    refined = waypoints[owner] + fraction * (waypoints[owner + 1] - waypoints[owner])
+    return np.vstack([refined, waypoints[-1:]])
+
+def _noise_level(q):
+    """
+    Robust estimate of the standard deviation of the noise on the waypoints.
+
+    Third differences of a smooth, densely sampled path are tiny, while white
+    noise of standard deviation sigma gives sigma * sqrt(20); the median keeps
+    isolated corners from counting as noise.
+    """
+    if len(q) < 4:
+        return 0.0
+    third = np.abs(np.diff(q, 3, axis=0))
+    return float(np.max(1.4826 * np.median(third, axis=0) / np.sqrt(20.0)))
+
+def _smooth(q, width, passes=3):
+    """Repeated centred moving average over `width` (odd) samples; the end points stay in place."""
+    half = width // 2
+    for _ in range(passes):
+        # odd reflection at the ends keeps the end points and the local direction
+        padded = np.concatenate([2 * q[:1] - q[half:0:-1], q, 2 * q[-1:] - q[-2:-half - 2:-1]])
+        total = np.concatenate([np.zeros((1, q.shape[1])), np.cumsum(padded, axis=0)])
+        q = (total[width:] - total[:-width]) / width
+    return q
+
+def smooth_path(waypoints, noise_window=300.0):
+    """
+    Denoise recorded waypoints before timing them with time_scale_path.
+
+    Sample noise looks like curvature (and adds path length) at every point,
+    which makes an exact timing of the noisy path slow. The noise level sigma
+    is estimated from third differences; when noise_window * sigma spans
+    several waypoints the path is smoothed over that arc length (three
+    moving-average passes), which moves it a few sigma away from the
+    waypoints. End points are kept, and clean paths are returned unchanged.
+    """
+    q = np.asarray(waypoints, dtype=float)
+    if q.ndim == 1:
+        q = q[:, None]
+    lengths = np.linalg.norm(np.diff(q, axis=0), axis=1)
+    if not np.any(lengths > 0):
+        return q.copy()
+    width = 2 * int(noise_window * _noise_level(q) / np.median(lengths[lengths > 0]) / 2) + 1
+    if width < 3 or len(q) <= width:
+        return q.copy()
+    return _smooth(q, width)
+
+def _segment_bounds(tangents, curvature, lengths, a_max):
+    """
+    Linear bounds y <= P + Q * x between the squared path speeds x and y at
+    the two ends of every segment.
+
+    The joint acceleration q' * s'' + q'' * s'^2 has to stay within a_max at
+    both ends, with s'' = (y - x) / (2 * ds) constant over the segment. Rows
+    hold the forward bounds (y from x) and the backward bounds (x from y);
+    bounds that do not apply are +inf.
+    """
+    two_ds = 2.0 * lengths[:, None]
+    forward_p, forward_q, backward_p, backward_q = [], [], [], []
+
+    def add(bounds_p, bounds_q, c, p, q):
+        bounds_p.append(np.where(c > 0, p, np.inf))
+        bounds_q.append(np.where(c > 0, q, 0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Both sides of |.| <= a, written with the sign that makes t = sign * q' positive
+        sign = np.where(tangents < 0, -1.0, 1.0)
+        t = sign * tangents
+        for side in (1.0, -1.0):
+            k_start = side * sign * curvature[:-1]
+            k_end = side * sign * curvature[1:]
+            ts = side * t
+            # start point: ts * (y - x) / 2ds + k_start * x <= a
+            add(forward_p, forward_q, ts, two_ds * a_max / ts, 1.0 - two_ds * k_start / ts)
+            c = k_start - ts / two_ds
+            add(backward_p, backward_q, c, a_max / c, -ts / (two_ds * c))
+            # end point: ts * (y - x) / 2ds + k_end * y <= a
+            c = ts / two_ds + k_end
+            add(forward_p, forward_q, c, a_max / c, ts / (two_ds * c))
+            add(backward_p, backward_q, -ts, -two_ds * a_max / ts, 1.0 + two_ds * k_end / ts)
+    return (np.hstack(forward_p), np.hstack(forward_q), np.hstack(backward_p), np.hstack(backward_q))
+
+def _sweep(cap, bound_p, bound_q):
+    """x[i + 1] = min(cap[i + 1], min over the bounds of P[i] + Q[i] * x[i]), from x[0] = cap[0]."""
+    # inf entries have Q = 0 and stay inf; bounds that rarely apply are checked only where finite
+    finite = np.isfinite(bound_p)
+    dense = finite.mean(axis=0) > 0.5
+    sparse = {}
+    for i, j in zip(*np.nonzero(finite & ~dense)):
+        sparse.setdefault(i, []).append((bound_p[i, j], bound_q[i, j]))
+    columns = [column.tolist() for column in (*bound_p[:, dense].T, *bound_q[:, dense].T)]
+    k = len(columns) // 2
+    x = [float(cap[0])]
+    previous = x[0]
+    for i, limit in enumerate(cap[1:].tolist()):
+        if k == 4:  # two joints, the arm's case
+            limit = min(limit, columns[0][i] + columns[4][i] * previous, columns[1][i] + columns[5][i] * previous,
+                        columns[2][i] + columns[6][i] * previous, columns[3][i] + columns[7][i] * previous)
+        else:
+            for j in range(k):
+                limit = min(limit, columns[j][i] + columns[k + j][i] * previous)
+        for p, q in sparse.get(i, ()):
+            limit = min(limit, p + q * previous)
+        previous = max(limit, 0.0)
+        x.append(previous)
+    return np.array(x)
+
+def time_scale_path(waypoints, max_velocity, max_acceleration, rate=100.0, min_segments=1000):
+    """
+    Minimum-time, rest-to-rest timing of a sampled joint-space path.
+
+    The path is the polyline through `waypoints` (N, n_joints), parameterized
+    by joint-space arc length s, and is followed exactly (see smooth_path for
+    noisy recordings). The squared path speed is limited at every waypoint by
+    the joint velocity limits and by the curvature, and the joint
+    accelerations q' s'' + q'' s'^2 are kept within max_acceleration at both
+    ends of every segment. A forward (accelerate) and a backward (brake)
+    reachability pass then give the fastest profile under these limits; the
+    passes are a Python loop, about 1 us per segment and joint. A sharp
+    corner is taken within one control period, so the velocity jump it
+    causes is capped to one period of acceleration; when waypoints are much
+    closer than one period the sampled acceleration can still exceed the
+    limit by a few percent. Paths with fewer than min_segments segments are
+    refined first so short moves are not forced to stop at every waypoint.
+
+    Returns a TimedTrajectory resampled at `rate` Hz.
+    """
+    q = np.asarray(waypoints, dtype=float)
+    if q.ndim == 1:
+        q = q[:, None]
+    n = q.shape[1]
+    v_max = _per_joint(max_velocity, n)
+    a_max = _per_joint(max_acceleration, n)
+
+    lengths = np.linalg.norm(np.diff(q, axis=0), axis=1)
+    q = q[np.concatenate([[True], lengths > 0])]  # repeated points add no path
+    if len(q) < 2:
+        zeros = np.zeros((1, n))
+        return TimedTrajectory(np.zeros(1), q[:1], zeros, zeros.copy())
+    lengths = lengths[lengths > 0]
+    if len(lengths) < min_segments:
+        q = _refine(q, lengths, min_segments)
+        lengths = np.linalg.norm(np.diff(q, axis=0), axis=1)
+
+    tangents = np.diff(q, axis=0) / lengths[:, None]
+    turn = np.zeros_like(q)
+    turn[1:-1] = np.diff(tangents, axis=0)
+    curvature = turn / np.concatenate([[1.0], 0.5 * (lengths[:-1] + lengths[1:]), [1.0]])[:, None]
+    with np.errstate(divide="ignore"):
+        # Velocity: the steepest of the segments that meet at the point applies
+        slope = np.abs(tangents)
+        slope = np.maximum(np.vstack([slope[:1], slope]), np.vstack([slope, slope[-1:]]))
+        cap = np.min((v_max / slope) ** 2, axis=1)
+        # The curvature alone must not exceed the acceleration limit
+        cap = np.minimum(cap, np.min(a_max / np.abs(curvature), axis=1))
+        # A sharp corner is taken within one control period: cap the velocity jump it causes
+        cap = np.minimum(cap, np.min((a_max / (rate * np.abs(turn))) ** 2, axis=1))
+    cap[[0, -1]] = 0.0
+
+    forward_p, forward_q, backward_p, backward_q = _segment_bounds(tangents, curvature, lengths, a_max)
+    x = _sweep(cap, forward_p, forward_q)
+    x = np.minimum(x, _sweep(x[::-1], backward_p[::-1], backward_q[::-1])[::-1])
+
+    root = np.sqrt(x)
+    segment_time = 2.0 * lengths / (root[:-1] + root[1:])
+    starts = np.concatenate([[0.0], np.cumsum(segment_time)])
+    time = _control_grid(starts[-1], rate)
+    i = np.clip(np.searchsorted(starts, time, side="right") - 1, 0, len(lengths) - 1)
+    tau = np.clip(time - starts[i], 0.0, segment_time[i])
+    u = (x[i + 1] - x[i]) / (2.0 * lengths[i])
+    s_dot = root[i] + u * tau
+    travelled = np.minimum(root[i] * tau + 0.5 * u * tau ** 2, lengths[i])
+    moving = (time < starts[-1])[:, None]
+    return TimedTrajectory(time, q[i] + travelled[:, None] * tangents[i],
+                           np.where(moving, s_dot[:, None] * tangents[i], 0.0),
+                           np.where(moving, u[:, None] * tangents[i], 0.0))
@@ -0,0 +1,111 @@
+import time
+import numpy as np
+
+class AnimationScheduler:
+    def __init__(self, root, render, frame_interval_ms=20, clock=time.perf_counter):
+        """
+        Plays a precomputed sequence of frames on the Tk event loop.
+
+        render(i) draws frame i. Frame times are given to play(); on each
+        root.after tick the frame due at the current wall-clock time is drawn,
+        so frames are dropped instead of slowing playback down when rendering
+        falls behind.
+        """
+        self.root = root
+        self.render = render
+        self.frame_interval_ms = frame_interval_ms
+        self.clock = clock
+        self.times = None
+        self.speed = 1.0
+        self.on_finish = None
+        self.position = 0.0
+        self.frames_rendered = 0
+        self.frames_dropped = 0
+        self._anchor = 0.0
+        self._running = False
+        self._job = None
+        self._last_index = -1
+
+    @property
+    def playing(self):
+        return self._running
+
+    @property
+    def duration(self):
+        return float(self.times[-1]) if self.times is not None else 0.0
+
+    def current_time(self):
+        """Playback time in seconds of the profile (not of the wall clock)."""
+        if not self.playing:
+            return self.position
+        return self.position + (self.clock() - self._anchor) * self.speed
+
+    def play(self, times, speed=1.0, on_finish=None):
+        """Start playing frames scheduled at `times` (seconds, increasing)."""
+        self.stop()
+        self.times = np.asarray(times, dtype=float)
+        self.speed = speed
+        self.on_finish = on_finish
+        self.position = float(self.times[0])
+        self.frames_rendered = 0
+        self.frames_dropped = 0
+        self._last_index = -1
+        self.resume()
+
+    def pause(self):
+        if self.playing:
+            self.position = self.current_time()
+            self.stop()
+
+    def resume(self):
+        if self.times is None or self.playing:
+            return
+        if self.position >= self.duration:
+            self.position = float(self.times[0])
+        self._anchor = self.clock()
+        self._running = True
+        self._tick()
+
+    def seek(self, t):
+        """Jump to playback time t and draw that frame, whether playing or paused."""
+        if self.times is None:
+            return
+        self.position = float(np.clip(t, self.times[0], self.duration))
+        self._anchor = self.clock()
+        self._last_index = -1
+        self._render_at(self.position)
+
+    def set_speed(self, speed):
+        self.position = self.current_time()
+        self._anchor = self.clock()
+        self.speed = speed
+
+    def stop(self):
+        self._running = False
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+
+    def _render_at(self, t):
+        index = max(int(np.searchsorted(self.times, t, side='right')) - 1, 0)
+        if index != self._last_index:
+            if self._last_index >= 0 and index > self._last_index + 1:
+                self.frames_dropped += index - self._last_index - 1
+            self._last_index = index
+            self.render(index)
+            self.frames_rendered += 1
+
+    def _tick(self):
+        self._job = None
+        if not self._running:
+            return
+        t = self.current_time()
+        if t >= self.duration:
+            self.position = self.duration
+            self._running = False
+            self._render_at(self.duration)
+            if self.on_finish:
+                self.on_finish()
+            return
+        self._render_at(t)
+        self._job = self.root.after(self.frame_interval_ms, self._tick)
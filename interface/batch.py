@@ -0,0 +1,84 @@
+from collections import deque
+import itertools
+import numpy as np
+from kinematics.kinematics import ForearmKinematics, inverse_kinematics_2d_batch
+
+IK_HEADER = ["Theta1 (rad)", "Theta2 (rad)"]
+FK_HEADER = ["X (m)", "Y (m)"]
+
+def stream_chunks(stream, chunk_size):
+    """Read two-column CSV rows from a text stream (e.g. stdin), skipping a header line if present."""
+    first = stream.readline()
+    try:
+        pending = [first] if first and np.loadtxt([first], delimiter=",", ndmin=2).size else []
+    except ValueError:
+        pending = []
+    lines = itertools.chain(pending, stream)
+    while True:
+        block = list(itertools.islice(lines, chunk_size))
+        if not block:
+            return
+        yield np.loadtxt(block, delimiter=",", ndmin=2)
+
+def solve_chunk(chunk, mode="ik", l1=1.0, l2=1.0, max_elbow_angle=np.pi, drop_unreachable=False, initial=None):
+    """
+    Solve one chunk of a batch job.
+
+    mode "ik" maps (x, y) targets to joint angles; targets that are out of
+    reach or beyond the elbow limit become NaN rows, or are dropped.
+    mode "fk" maps (theta1, theta2) rows to end-effector (x, y).
+    """
+    chunk = np.asarray(chunk, dtype=float)
+    if chunk.size == 0:
+        chunk = chunk.reshape(0, 2)
+    if chunk.ndim != 2 or chunk.shape[1] != 2:
+        raise ValueError(f"Batch rows must have 2 columns, got an array of shape {chunk.shape}")
+    if mode == "fk":
+        arm = ForearmKinematics([(l1, 0, 0, 0), (l2, 0, 0, 0)])
+        return arm.forward_kinematics_batch(chunk)[:, :2, 3]
+    angles, reachable, _ = inverse_kinematics_2d_batch(chunk, l1, l2, initial=initial)
+    valid = reachable & (np.abs(angles[:, 1]) <= max_elbow_angle)
+    if drop_unreachable:
+        return angles[valid]
+    angles[~valid] = np.nan
+    return angles
+
+def _solve_job(args):
+    chunk, options = args
+    return solve_chunk(chunk, **options)
+
+def run_batch(source, sink, workers=1, **options):
+    """
+    Solve every chunk of `source` and write the results to `sink` in order.
+
+    With one worker the IK branch stays continuous across chunks. With more,
+    chunks are solved independently in a process pool, keeping at most two
+    chunks per worker in flight so memory stays bounded. Returns the number
+    of rows written.
+    """
+    written = 0
+    try:
+        if workers <= 1:
+            initial = None
+            for chunk in source:
+                out = solve_chunk(chunk, initial=initial, **options)
+                solved = np.flatnonzero(np.isfinite(out[:, 0]))
+                if len(solved):
+                    initial = out[solved[-1]]
+                sink.write(out)
+                written += len(out)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                for chunk in itertools.chain(source, [None]):
+                    if chunk is not None:
+                        pending.append(pool.submit(_solve_job, (chunk, options)))
+                    while pending and (chunk is None or len(pending) >= 2 * workers):
+                        out = pending.popleft().result()
+                        sink.write(out)
+                        written += len(out)
+    finally:
+        sink.close()
+    return written
@@ -1,20 +1,72 @@
 import argparse
+import sys
 import numpy as np
-from visualization.arm_plotter import plot_2d_arm
 from kinematics.kinematics import inverse_kinematics_2d
 
+def run_batch_mode(args):
+    # Kinematics only: this mode never imports matplotlib or Tk
+    from interface.batch import FK_HEADER, IK_HEADER, run_batch, stream_chunks
+    from interface.motion_profiles import file_chunks, profile_chunks
+    from interface.profile_io import PROFILE_EXTENSION
+    from interface.trajectory_pipeline import BinarySink, CsvSink
+
+    if args.batch == "-":
+        source = stream_chunks(sys.stdin, args.chunk_size)
+    elif args.fk and args.batch.endswith(PROFILE_EXTENSION):
+        source = profile_chunks(args.batch, args.chunk_size)
+    else:
+        # in IK mode a binary profile is converted to (x, y) positions
+        source = file_chunks(args.batch, args.chunk_size)
+
+    header = FK_HEADER if args.fk else IK_HEADER
+    if args.output == "-":
+        sink = CsvSink(sys.stdout, header)
+    elif args.output.endswith(PROFILE_EXTENSION):
+        sink = BinarySink(args.output, link_lengths=(args.l1, args.l2))
+    else:
+        sink = CsvSink(args.output, header)
+
+    count = run_batch(source, sink, workers=args.workers, mode="fk" if args.fk else "ik",
+                      l1=args.l1, l2=args.l2, max_elbow_angle=np.deg2rad(args.max_elbow),
+                      drop_unreachable=args.drop_unreachable)
+    print(f"Solved {count} rows", file=sys.stderr)
+
 def main():
     parser = argparse.ArgumentParser(description="Robotic Forearm CLI")
-    parser.add_argument("--x", type=float, help="Target X position", required=True)
-    parser.add_argument("--y", type=float, help="Target Y position", required=True)
+    parser.add_argument("--x", type=float, help="Target X position")
+    parser.add_argument("--y", type=float, help="Target Y position")
     parser.add_argument("--l1", type=float, default=1.0, help="Link 1 length")
     parser.add_argument("--l2", type=float, default=1.0, help="Link 2 length")
+    parser.add_argument("--max-elbow", type=float, default=180.0, help="Max elbow angle (deg)")
+    parser.add_argument("--batch", metavar="INPUT", help="Solve every row of a CSV or binary file ('-' for stdin), headless")
+    parser.add_argument("--output", default="-", help="Batch output file, CSV or binary by extension ('-' for stdout)")
+    parser.add_argument("--fk", action="store_true", help="Batch forward kinematics: rows are (theta1, theta2)")
+    parser.add_argument("--drop-unreachable", action="store_true", help="Omit unreachable targets instead of writing NaN rows")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for batch mode")
+    parser.add_argument("--chunk-size", type=int, default=4096, help="Rows per batch chunk")
 
     args = parser.parse_args()
 
+    if args.batch:
+        run_batch_mode(args)
+        return
+    if args.x is None or args.y is None:
+        parser.error("--x and --y are required unless --batch is given")
+
+    from kinematics.workspace import is_reachable
+    max_elbow = np.deg2rad(args.max_elbow)
+    if not is_reachable(args.x, args.y, args.l1, args.l2, max_elbow):
+        # the grid is only needed to suggest the nearest reachable point
+        from kinematics.workspace import WorkspaceGrid, DEFAULT_CACHE_DIR
+        workspace = WorkspaceGrid(args.l1, args.l2, max_elbow, cache_dir=DEFAULT_CACHE_DIR)
+        nx, ny = workspace.nearest_reachable(args.x, args.y)
+        print(f"Error: Target unreachable, nearest reachable point: x={nx:.2f}, y={ny:.2f}")
+        return
+
     try:
         theta1, theta2 = inverse_kinematics_2d(args.x, args.y, args.l1, args.l2)
         print(f"Joint Angles (rad): θ1={theta1:.2f}, θ2={theta2:.2f}")
+        from visualization.arm_plotter import plot_2d_arm
         plot_2d_arm(theta1, theta2, args.l1, args.l2)
     except ValueError as e:
         print(f"Error: {e}")
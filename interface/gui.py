@@ -1,20 +1,32 @@
 # gui.py (Interfaz profesional completa y funcional)
 
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
-from visualization.arm_plotter import ArmPlot2D
-from visualization.arm_plotter_3d import ArmPlot3D
+import os
+import profiling
+from interface.lazy import LazyModule
 from kinematics.kinematics import inverse_kinematics_2d
+from kinematics.workspace import WorkspaceGrid, DEFAULT_CACHE_DIR, is_reachable
+from interface.animation import AnimationScheduler
+from control.time_scaling import point_to_point
+from interface.profile_io import (PROFILE_EXTENSION, load_profile_binary, read_profile_csv,
+                                  save_profile_binary, write_profile_csv)
 import numpy as np
-import time
-import csv
-import matplotlib.pyplot as plt
+
+# Tk y matplotlib solo se cargan al abrir la ventana
+tk = LazyModule("tkinter")
+ttk = LazyModule("tkinter.ttk")
+messagebox = LazyModule("tkinter.messagebox")
+filedialog = LazyModule("tkinter.filedialog")
+
+PROFILE_FILETYPES = [("CSV Files", "*.csv"), ("Binary Profiles", "*" + PROFILE_EXTENSION)]
+OVERLAY_INTERVAL_MS = 250
+DEFAULT_PROFILE_RATE = 50.0  # Hz, CSV profiles carry no sample rate
+ANIMATION_RATE = 50.0  # Hz, sample rate of moves timed for display
 
 class ArmGUI:
     def __init__(self, root):
         self.root = root
         self.root.title("Bioinspired Robotic Forearm Simulator")
-        self.root.geometry("900x850")
+        self.root.geometry("900x900")
         self.root.resizable(False, False)
 
         self.l1 = 1.0
@@ -24,6 +36,17 @@ class ArmGUI:
         self.current_step = 0
         self.plot_mode = tk.StringVar(value="2D")
         self.max_elbow_angle = tk.DoubleVar(value=150.0)
+        self.workspace = None
+        self.profile_rate = DEFAULT_PROFILE_RATE  # Hz, sample rate of loaded profiles
+        self.playback_speed = tk.StringVar(value="1.0")
+        self.seek_var = tk.DoubleVar(value=0.0)
+        self.animation = AnimationScheduler(self.root, self.render_frame)
+        self.anim_path = None
+        self.anim_limit_deg = None
+        self.anim_is_profile = False
+        self.show_frame_time = tk.BooleanVar(value=False)
+        self.overlay = None
+        self.overlay_job = None
 
         self.plot_area = None
         self.setup_styles()
@@ -52,6 +75,8 @@ class ArmGUI:
         mode_selector = ttk.Combobox(mode_frame, textvariable=self.plot_mode, values=["2D", "3D"], state="readonly", width=5)
         mode_selector.pack(side="left", padx=5)
         mode_selector.bind("<<ComboboxSelected>>", self.switch_mode)
+        ttk.Checkbutton(mode_frame, text="Show frame time", variable=self.show_frame_time,
+                        command=self.toggle_frame_overlay).pack(side="left", padx=10)
 
         slider_frame = ttk.LabelFrame(self.root, text="Manual Joint Control (Angles)", padding=15)
         slider_frame.pack(padx=15, pady=10, fill="x")
@@ -100,6 +125,16 @@ class ArmGUI:
         for i, (label, cmd) in enumerate(buttons):
             ttk.Button(action_frame, text=label, command=cmd).grid(row=0, column=i, padx=5, pady=5)
 
+        playback_frame = ttk.Frame(self.root)
+        playback_frame.pack(pady=5)
+        ttk.Button(playback_frame, text="▶ Play Profile", command=self.play_profile).pack(side="left", padx=5)
+        ttk.Button(playback_frame, text="⏯ Pause", command=self.toggle_pause).pack(side="left", padx=5)
+        ttk.Label(playback_frame, text="Speed:").pack(side="left")
+        speed_selector = ttk.Combobox(playback_frame, textvariable=self.playback_speed, values=["0.25", "0.5", "1.0", "2.0", "4.0"], state="readonly", width=5)
+        speed_selector.pack(side="left", padx=5)
+        speed_selector.bind("<<ComboboxSelected>>", lambda event: self.animation.set_speed(float(self.playback_speed.get())))
+        ttk.Scale(playback_frame, from_=0, to=1, orient="horizontal", length=250, variable=self.seek_var, command=self.seek_profile).pack(side="left", padx=5)
+
         ttk.Separator(self.root, orient="horizontal").pack(fill="x", pady=5)
 
         self.footer = ttk.Label(self.root, text=f"Link lengths: L1 = {self.l1}, L2 = {self.l2}", font=("Segoe UI", 9, "italic"))
@@ -113,6 +148,13 @@ class ArmGUI:
         max_angle_rad = np.deg2rad(self.max_elbow_angle.get())
         return abs(theta2_rad) <= max_angle_rad
 
+    def get_workspace(self):
+        max_angle_rad = np.deg2rad(self.max_elbow_angle.get())
+        if (self.workspace is None or self.workspace.max_elbow_angle != max_angle_rad
+                or (self.workspace.l1, self.workspace.l2) != (self.l1, self.l2)):
+            self.workspace = WorkspaceGrid(self.l1, self.l2, max_angle_rad, cache_dir=DEFAULT_CACHE_DIR)
+        return self.workspace
+
     def plot_arm(self):
         theta1 = np.deg2rad(self.theta1_var.get())
         theta2 = np.deg2rad(self.theta2_var.get())
@@ -130,55 +172,109 @@ class ArmGUI:
         try:
             x = float(self.x_entry.get())
             y = float(self.y_entry.get())
-            theta1, theta2 = inverse_kinematics_2d(x, y, self.l1, self.l2)
-            if not self.validate_elbow_angle(theta2):
-                messagebox.showwarning("Angle Limit", "Elbow angle exceeds limit.")
-                return
-            self.animate_to(theta1, theta2)
-        except Exception:
+        except ValueError:
             messagebox.showerror("Invalid Input", "Please enter valid X and Y values.")
+            return
+        if not is_reachable(x, y, self.l1, self.l2, np.deg2rad(self.max_elbow_angle.get())):
+            try:
+                nx, ny = self.get_workspace().nearest_reachable(x, y)
+            except Exception as e:
+                # scipy ausente, caché no escribible o fichero .npz corrupto
+                messagebox.showerror("Workspace Error", f"Could not build the workspace map: {type(e).__name__}: {e}")
+                return
+            messagebox.showwarning("Unreachable", f"Target out of reach. Nearest reachable point: ({nx:.2f}, {ny:.2f})")
+            return
+        theta1, theta2 = inverse_kinematics_2d(x, y, self.l1, self.l2)
+        if not self.validate_elbow_angle(theta2):
+            messagebox.showwarning("Angle Limit", "Elbow angle exceeds limit.")
+            return
+        self.animate_to(theta1, theta2)
+
+    def animate_to(self, theta1, theta2, max_velocity=np.pi, max_acceleration=3 * np.pi):
+        # Movimiento de tiempo mínimo respetando los límites de velocidad y aceleración
+        start = np.deg2rad([self.theta1_var.get(), self.theta2_var.get()])
+        move = point_to_point(start, [theta1, theta2], max_velocity, max_acceleration, rate=ANIMATION_RATE)
+        self.start_animation(move.position, move.time)
+
+    def start_animation(self, path, times, speed=1.0, is_profile=False):
+        # Los perfiles mapeados en memoria no se copian: cada fotograma lee solo su muestra
+        self.anim_path = np.asarray(path, dtype=float)
+        self.anim_limit_deg = self.max_elbow_angle.get()
+        self.anim_is_profile = is_profile
+        self.animation.play(times, speed=speed)
+
+    def render_frame(self, i):
+        t1, t2 = self.anim_path[i]
+        self.theta1_var.set(np.rad2deg(t1))
+        self.theta2_var.set(np.rad2deg(t2))
+        self.update_labels()
+        self.plot_area.update(t1, t2, elbow_limit_deg=self.anim_limit_deg)
+        if self.anim_is_profile and self.animation.duration > 0:
+            self.seek_var.set(self.animation.times[i] / self.animation.duration)
+
+    def play_profile(self):
+        if len(self.loaded_profile) == 0:
+            messagebox.showwarning("No Profile", "Load a profile first.")
+            return
+        path = np.asarray(self.loaded_profile, dtype=float)
+        times = np.arange(len(path)) / self.profile_rate
+        self.start_animation(path, times, speed=float(self.playback_speed.get()), is_profile=True)
 
-    def animate_to(self, theta1, theta2, steps=30):
-        t1_init = np.deg2rad(self.theta1_var.get())
-        t2_init = np.deg2rad(self.theta2_var.get())
-        for t1, t2 in zip(np.linspace(t1_init, theta1, steps), np.linspace(t2_init, theta2, steps)):
-            self.theta1_var.set(np.rad2deg(t1))
-            self.theta2_var.set(np.rad2deg(t2))
-            self.update_labels()
-            self.plot_area.update(t1, t2, elbow_limit_deg=self.max_elbow_angle.get())
-            self.root.update()
-            time.sleep(0.02)
+    def toggle_pause(self):
+        if self.animation.playing:
+            self.animation.pause()
+        else:
+            self.animation.resume()
+
+    def seek_profile(self, value):
+        if self.anim_is_profile:
+            self.animation.seek(float(value) * self.animation.duration)
+
+    def save_profile_file(self, filepath, samples):
+        samples = np.asarray(samples, dtype=float)
+        if samples.size == 0:
+            samples = samples.reshape(0, 2)
+        if samples.ndim != 2 or samples.shape[1] != 2:
+            raise ValueError(f"Profiles must have 2 joint columns, got an array of shape {samples.shape}")
+        if filepath.endswith(PROFILE_EXTENSION):
+            max_angle_rad = np.deg2rad(self.max_elbow_angle.get())
+            save_profile_binary(filepath, samples, sample_rate=self.profile_rate, link_lengths=(self.l1, self.l2),
+                                joint_limits=[(-np.pi, np.pi), (-max_angle_rad, max_angle_rad)])
+        else:
+            write_profile_csv(filepath, samples)
 
     def export_profile(self):
-        filepath = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV Files", "*.csv")])
+        filepath = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=PROFILE_FILETYPES)
         if not filepath:
             return
-        with open(filepath, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(["Theta1 (rad)", "Theta2 (rad)"])
-            for t1, t2 in self.motion_profile:
-                writer.writerow([t1, t2])
+        try:
+            self.save_profile_file(filepath, self.motion_profile)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
 
     def load_profile(self):
-        filepath = filedialog.askopenfilename(filetypes=[("CSV Files", "*.csv")])
+        filepath = filedialog.askopenfilename(filetypes=PROFILE_FILETYPES)
         if not filepath:
             return
         try:
-            with open(filepath, 'r') as f:
-                lines = f.readlines()[1:]
-                self.loaded_profile = []
-                for line in lines:
-                    parts = line.strip().split(',')
-                    t1, t2 = float(parts[0]), float(parts[1])
-                    self.loaded_profile.append((t1, t2))
+            if filepath.endswith(PROFILE_EXTENSION):
+                # Mapeado en memoria: solo se leen del disco los pasos que se usan
+                profile = load_profile_binary(filepath)
+                self.loaded_profile = profile.samples
+                self.profile_rate = profile.sample_rate
+            else:
+                self.loaded_profile = read_profile_csv(filepath)
+                self.profile_rate = DEFAULT_PROFILE_RATE
             messagebox.showinfo("Loaded", f"Loaded {len(self.loaded_profile)} steps.")
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
     def edit_profile(self):
-        if not self.loaded_profile:
+        if len(self.loaded_profile) == 0:
             messagebox.showwarning("No Profile", "Load a profile first.")
             return
+        if not isinstance(self.loaded_profile, list):
+            self.loaded_profile = [tuple(step) for step in np.asarray(self.loaded_profile).tolist()]
         editor = tk.Toplevel(self.root)
         editor.title("Edit Motion Profile")
         editor.geometry("400x300")
@@ -222,14 +318,14 @@ class ArmGUI:
                 show_step(self.current_step)
 
         def save_to_file():
-            path = filedialog.asksaveasfilename(defaultextension=".csv")
+            path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=PROFILE_FILETYPES)
             if not path:
                 return
-            with open(path, 'w', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(["Theta1 (rad)", "Theta2 (rad)"])
-                for t1, t2 in self.loaded_profile:
-                    writer.writerow([t1, t2])
+            try:
+                self.save_profile_file(path, self.loaded_profile)
+            except ValueError as e:
+                messagebox.showerror("Error", str(e))
+                return
             messagebox.showinfo("Saved", "Profile saved.")
 
         ttk.Button(editor, text="◀ Prev", command=lambda: show_step(self.current_step - 1)).pack(side="left", padx=5)
@@ -244,13 +340,40 @@ class ArmGUI:
         if self.plot_area:
             self.plot_area.canvas_widget.destroy()
         if self.plot_mode.get() == "2D":
+            from visualization.arm_plotter import ArmPlot2D
             self.plot_area = ArmPlot2D(self.root, self.l1, self.l2)
         else:
+            from visualization.arm_plotter_3d import ArmPlot3D
             self.plot_area = ArmPlot3D(self.root, self.l1, self.l2)
         self.plot_arm()
 
+    def toggle_frame_overlay(self):
+        # Un solo bucle de refresco: se cancela el pendiente antes de crear otro
+        if self.overlay_job is not None:
+            self.root.after_cancel(self.overlay_job)
+            self.overlay_job = None
+        if self.show_frame_time.get():
+            if self.overlay is None:
+                self.overlay = tk.Label(self.root, font=("Consolas", 9), bg="#202020", fg="#7CFC00", padx=4)
+                self.overlay.place(relx=1.0, x=-5, y=5, anchor="ne")
+            self.refresh_frame_overlay()
+        elif self.overlay is not None:
+            self.overlay.destroy()
+            self.overlay = None
+
+    def refresh_frame_overlay(self):
+        # Tiempo del último frame y media de la ventana del FrameTimer del plot
+        self.overlay_job = None
+        if self.overlay is None:
+            return
+        timer = self.plot_area.frame_timer
+        self.overlay.config(text=f"frame {timer.last * 1e3:5.1f} ms | avg {timer.mean * 1e3:5.1f} ms | {timer.fps:4.0f} FPS")
+        self.overlay_job = self.root.after(OVERLAY_INTERVAL_MS, self.refresh_frame_overlay)
+
     def on_close(self):
+        self.animation.stop()
         try:
+            import matplotlib.pyplot as plt
             plt.close('all')
         except:
             pass
@@ -258,7 +381,17 @@ class ArmGUI:
         self.root.destroy()
 
 if __name__ == "__main__":
+    # FOREARM_PROFILE=out.json (or out.trace.json for a Chrome trace) records the hot paths
+    profile_path = os.environ.get("FOREARM_PROFILE")
+    if profile_path:
+        profiling.enable(trace=profile_path.endswith(".trace.json"))
     root = tk.Tk()
     app = ArmGUI(root)
     root.protocol("WM_DELETE_WINDOW", app.on_close)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+    if profile_path:
+        profiling.disable()
+        if profile_path.endswith(".trace.json"):
+            profiling.dump_chrome_trace(profile_path)
+        else:
+            profiling.dump_json(profile_path)
\ No newline at end of file
@@ -1,6 +1,90 @@
+import numpy as np
+from interface.profile_io import PROFILE_EXTENSION, load_profile_binary
+
+DEFAULT_CHUNK_SIZE = 4096
+
 def circular_trajectory(radius=1.0, steps=100):
     import numpy as np
     for angle in np.linspace(0, 2 * np.pi, steps):
         x = radius * np.cos(angle)
         y = radius * np.sin(angle)
         yield x, y
+
+def _parametric_chunks(curve, steps, chunk_size):
+    """Evaluate curve(u) for u in [0, 1] (steps samples) and yield (n, 2) chunks."""
+    for start in range(0, steps, chunk_size):
+        index = np.arange(start, min(start + chunk_size, steps))
+        u = index / (steps - 1) if steps > 1 else np.zeros(len(index))
+        yield curve(u)
+
+def circle_chunks(radius=1.0, steps=100, center=(0.0, 0.0), chunk_size=DEFAULT_CHUNK_SIZE):
+    """Same path as circular_trajectory, as (n, 2) chunks of (x, y) targets."""
+    def curve(u):
+        angle = 2 * np.pi * u
+        return np.column_stack([center[0] + radius * np.cos(angle), center[1] + radius * np.sin(angle)])
+    return _parametric_chunks(curve, steps, chunk_size)
+
+def line_chunks(start, end, steps=100, chunk_size=DEFAULT_CHUNK_SIZE):
+    start = np.asarray(start, dtype=float)
+    end = np.asarray(end, dtype=float)
+    return _parametric_chunks(lambda u: start + np.multiply.outer(u, end - start), steps, chunk_size)
+
+def figure_eight_chunks(width=1.0, height=0.5, center=(1.0, 0.0), steps=100, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Lemniscate of Gerono around center, traced once."""
+    def curve(u):
+        t = 2 * np.pi * u
+        return np.column_stack([center[0] + width * np.sin(t), center[1] + height * np.sin(t) * np.cos(t)])
+    return _parametric_chunks(curve, steps, chunk_size)
+
+def lissajous_chunks(amplitude=(0.5, 0.5), frequency=(3, 2), phase=np.pi / 2, center=(1.0, 0.0),
+                     steps=100, chunk_size=DEFAULT_CHUNK_SIZE):
+    def curve(u):
+        t = 2 * np.pi * u
+        return np.column_stack([center[0] + amplitude[0] * np.sin(frequency[0] * t + phase),
+                                center[1] + amplitude[1] * np.sin(frequency[1] * t)])
+    return _parametric_chunks(curve, steps, chunk_size)
+
+def spline_chunks(waypoints, steps=100, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Catmull-Rom spline through the (x, y) waypoints, sampled uniformly in the spline parameter."""
+    points = np.asarray(waypoints, dtype=float)
+    # repeat the end points so the curve starts and ends on them
+    padded = np.concatenate([points[:1], points, points[-1:]])
+    n_segments = len(points) - 1
+
+    def curve(u):
+        s = u * n_segments
+        seg = np.minimum(s.astype(np.intp), n_segments - 1)
+        t = (s - seg)[:, np.newaxis]
+        p0, p1, p2, p3 = padded[seg], padded[seg + 1], padded[seg + 2], padded[seg + 3]
+        return 0.5 * (2 * p1 + (p2 - p0) * t + (2 * p0 - 5 * p1 + 4 * p2 - p3) * t**2
+                      + (3 * p1 - p0 - 3 * p2 + p3) * t**3)
+    return _parametric_chunks(curve, steps, chunk_size)
+
+def profile_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Stream the joint-angle samples of a binary profile in chunks."""
+    samples = load_profile_binary(path).samples
+    for start in range(0, len(samples), chunk_size):
+        yield np.array(samples[start:start + chunk_size])
+
+def file_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Stream (x, y) targets from a two-column CSV (header row optional) or a binary profile.
+
+    Binary profiles hold joint angles, so they are converted to end-effector
+    positions with the link lengths stored in the profile; NaN samples stay NaN.
+    """
+    if str(path).endswith(PROFILE_EXTENSION):
+        profile = load_profile_binary(path)
+        if profile.samples.shape[1] != 2 or len(profile.link_lengths) != 2:
+            raise ValueError(f"{path} is not a planar 2-link profile")
+        l1, l2 = profile.link_lengths
+        for angles in profile_chunks(path, chunk_size):
+            theta1, elbow = angles[:, 0], angles[:, 0] + angles[:, 1]
+            yield np.column_stack([l1 * np.cos(theta1) + l2 * np.cos(elbow),
+                                   l1 * np.sin(theta1) + l2 * np.sin(elbow)])
+        return
+    from interface.batch import stream_chunks
+
+    # misma detección de cabecera que la entrada por stdin
+    with open(path) as f:
+        yield from stream_chunks(f, chunk_size)
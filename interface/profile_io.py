@@ -0,0 +1,111 @@
+import csv
+import json
+import numpy as np
+
+PROFILE_EXTENSION = ".fap"
+MAGIC = b"FAPROF01"
+HEADER_SIZE = 512  # bytes, magic included; samples start right after it
+CSV_HEADER = ["Theta1 (rad)", "Theta2 (rad)"]
+
+class MotionProfile:
+    def __init__(self, samples, sample_rate, link_lengths, joint_limits):
+        """Joint-angle samples (N, n_joints) in radians plus the recording setup."""
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self.link_lengths = link_lengths
+        self.joint_limits = joint_limits
+
+    def __len__(self):
+        return len(self.samples)
+
+    @property
+    def times(self):
+        return np.arange(len(self.samples)) / self.sample_rate
+
+class ProfileWriter:
+    def __init__(self, path, n_joints=2, sample_rate=50.0, link_lengths=(1.0, 1.0), joint_limits=None):
+        """
+        Streams samples into a binary profile file.
+
+        The header is rewritten with the final sample count on close(), so
+        profiles of any length can be written chunk by chunk.
+        """
+        if joint_limits is None:
+            joint_limits = [(-np.pi, np.pi)] * n_joints
+        self.header = {
+            "n_joints": int(n_joints),
+            "count": 0,
+            "sample_rate": float(sample_rate),
+            "link_lengths": [float(l) for l in link_lengths],
+            "joint_limits": np.asarray(joint_limits, dtype=float).tolist(),
+        }
+        self.file = open(path, "wb")
+        self._write_header()
+
+    def _write_header(self):
+        text = json.dumps(self.header).encode("utf-8")
+        if len(MAGIC) + len(text) > HEADER_SIZE:
+            raise ValueError("Profile header too large")
+        self.file.seek(0)
+        self.file.write(MAGIC + text.ljust(HEADER_SIZE - len(MAGIC)))
+        self.file.seek(0, 2)
+
+    def write(self, samples):
+        samples = np.asarray(samples, dtype="<f8").reshape(-1, self.header["n_joints"])
+        self.file.write(np.ascontiguousarray(samples).tobytes())
+        self.header["count"] += len(samples)
+
+    def close(self):
+        if not self.file.closed:
+            self._write_header()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def save_profile_binary(path, samples, **kwargs):
+    samples = np.asarray(samples, dtype=float)
+    with ProfileWriter(path, n_joints=samples.shape[1] if samples.ndim == 2 else 2, **kwargs) as writer:
+        writer.write(samples)
+
+def load_profile_binary(path, mmap=True):
+    """
+    Open a binary profile. With mmap the samples are a read-only memory map,
+    so only the parts that are actually accessed are read from disk.
+    """
+    with open(path, "rb") as f:
+        block = f.read(HEADER_SIZE)
+    if block[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a binary motion profile")
+    header = json.loads(block[len(MAGIC):].decode("utf-8"))
+    shape = (header["count"], header["n_joints"])
+    if header["count"] == 0:
+        samples = np.empty(shape)
+    elif mmap:
+        samples = np.memmap(path, dtype="<f8", mode="r", offset=HEADER_SIZE, shape=shape)
+    else:
+        samples = np.fromfile(path, dtype="<f8", offset=HEADER_SIZE).reshape(shape)
+    return MotionProfile(samples, header["sample_rate"], tuple(header["link_lengths"]),
+                         np.asarray(header["joint_limits"]))
+
+def read_profile_csv(path):
+    """Read a CSV profile (one header row, one sample per line) into an (N, n_joints) array."""
+    return np.loadtxt(path, delimiter=",", skiprows=1, ndmin=2)
+
+def write_profile_csv(path, samples, chunk_size=65536):
+    samples = np.asarray(samples, dtype=float)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER if samples.shape[1] == 2 else [f"Theta{i + 1} (rad)" for i in range(samples.shape[1])])
+        for start in range(0, len(samples), chunk_size):
+            # repr() of a float round-trips exactly, so the conversion is lossless
+            writer.writerows(samples[start:start + chunk_size].tolist())
+
+def csv_to_binary(csv_path, binary_path, **kwargs):
+    save_profile_binary(binary_path, read_profile_csv(csv_path), **kwargs)
+
+def binary_to_csv(binary_path, csv_path):
+    write_profile_csv(csv_path, load_profile_binary(binary_path).samples)
@@ -0,0 +1,173 @@
+import numpy as np
+from interface.profile_io import (load_profile_binary, save_profile_binary, read_profile_csv,
+                                  write_profile_csv, csv_to_binary, binary_to_csv)
+
+def test_profile_binary_csv_roundtrip(tmp_path):
+    samples = np.random.default_rng(0).normal(size=(1000, 2))
+    write_profile_csv(tmp_path / "a.csv", samples)
+    csv_to_binary(tmp_path / "a.csv", tmp_path / "a.fap", sample_rate=100.0, link_lengths=(1.0, 0.8))
+
+    profile = load_profile_binary(tmp_path / "a.fap")
+    assert isinstance(profile.samples, np.memmap)
+    assert np.array_equal(profile.samples, samples)
+    assert profile.sample_rate == 100.0 and profile.link_lengths == (1.0, 0.8)
+    assert profile.times[-1] == 9.99
+
+    binary_to_csv(tmp_path / "a.fap", tmp_path / "b.csv")
+    assert (tmp_path / "a.csv").read_text() == (tmp_path / "b.csv").read_text()
+    assert np.array_equal(read_profile_csv(tmp_path / "b.csv"), samples)
+
+    save_profile_binary(tmp_path / "empty.fap", np.empty((0, 2)))
+    assert len(load_profile_binary(tmp_path / "empty.fap")) == 0
+
+def test_trajectory_pipeline_chunks_match_single_pass(tmp_path):
+    from interface.motion_profiles import circle_chunks, spline_chunks, file_chunks, profile_chunks
+    from interface.trajectory_pipeline import ArraySink, BinarySink, run_pipeline
+    from kinematics.kinematics import inverse_kinematics_2d_batch
+
+    sink = ArraySink()
+    stats = run_pipeline(circle_chunks(1.2, 5000, center=(0.5, 0.0), chunk_size=333), sink)
+    path = np.concatenate(list(circle_chunks(1.2, 5000, center=(0.5, 0.0))))
+    assert stats.samples_out == 5000
+    assert np.array_equal(sink.result(), inverse_kinematics_2d_batch(path, 1.0, 1.0)[0])
+
+    waypoints = [[1.0, 0.0], [1.5, 0.5], [0.5, 1.2], [0.0, 0.1]]
+    stats = run_pipeline(spline_chunks(waypoints, 2000, chunk_size=128), BinarySink(tmp_path / "a.fap"),
+                         max_elbow_angle=np.deg2rad(150), smoothing_window=5)
+    assert stats.over_limit > 0 and stats.samples_out == stats.samples_in - stats.over_limit - stats.unreachable
+    written = load_profile_binary(tmp_path / "a.fap").samples
+    valid = np.isfinite(written[:, 0])
+    # las muestras descartadas quedan como filas NaN: la salida sigue alineada con la entrada
+    assert len(written) == stats.samples_in and np.count_nonzero(valid) == stats.samples_out
+    assert np.all(np.abs(written[valid, 1]) <= np.deg2rad(150))
+    assert np.array_equal(np.concatenate(list(profile_chunks(tmp_path / "a.fap", 100))), written, equal_nan=True)
+
+    # sin suavizado, leer el perfil como objetivos (x, y) reproduce la trayectoria
+    run_pipeline(spline_chunks(waypoints, 2000, chunk_size=128), BinarySink(tmp_path / "b.fap"),
+                 max_elbow_angle=np.deg2rad(150))
+    path = np.concatenate(list(spline_chunks(waypoints, 2000)))
+    targets = np.concatenate(list(file_chunks(tmp_path / "b.fap", 100)))
+    assert np.allclose(targets[valid], path[valid], atol=1e-9) and np.isnan(targets[~valid]).all()
+
+def test_file_chunks_header_is_optional(tmp_path):
+    from interface.motion_profiles import file_chunks
+
+    targets = np.array([[1.0, 1.0], [0.5, 0.5], [1.5, 0.2]])
+    write_profile_csv(tmp_path / "with_header.csv", targets)
+    (tmp_path / "no_header.csv").write_text("".join(f"{x!r},{y!r}\n" for x, y in targets.tolist()))
+    for name in ("with_header.csv", "no_header.csv"):
+        chunks = list(file_chunks(tmp_path / name, chunk_size=2))
+        assert [len(c) for c in chunks] == [2, 1]
+        assert np.array_equal(np.concatenate(chunks), targets)
+
+def test_solve_chunk_rejects_extra_columns():
+    import pytest
+    from interface.batch import solve_chunk
+
+    assert solve_chunk(np.empty((0, 2))).shape == (0, 2)
+    with pytest.raises(ValueError, match="2 columns"):
+        solve_chunk(np.ones((4, 3)))
+
+def test_cli_batch_mode_is_headless(tmp_path):
+    import os
+    import subprocess
+    import sys
+
+    targets = np.array([[1.0, 1.0], [3.0, 0.0], [0.5, 0.5]])
+    write_profile_csv(tmp_path / "targets.csv", targets)
+    script = ("import sys; from interface import cli; cli.main(); "
+              "assert 'matplotlib' not in sys.modules and 'tkinter' not in sys.modules")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", script, "--batch", str(tmp_path / "targets.csv"),
+                    "--output", str(tmp_path / "out.csv")], cwd=root, check=True, capture_output=True)
+
+    angles = read_profile_csv(tmp_path / "out.csv")
+    assert np.allclose(angles[0], [0.0, np.pi / 2])
+    assert np.isnan(angles[1]).all() and np.isfinite(angles[2]).all()
+
+def test_cli_single_target_is_checked_without_a_grid(tmp_path):
+    import os
+    import subprocess
+    import sys
+
+    script = ("import sys, visualization.arm_plotter as plotter; from interface import cli; "
+              "plotter.plot_2d_arm = lambda *args: None; cli.main(); "
+              "assert 'scipy' not in sys.modules")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, HOME=str(tmp_path), MPLBACKEND="Agg")
+    result = subprocess.run([sys.executable, "-c", script, "--x", "1.0", "--y", "1.0"],
+                            cwd=root, env=env, check=True, capture_output=True, text=True)
+    assert "θ1=0.00" in result.stdout
+    assert not os.path.exists(os.path.join(tmp_path, ".cache", "bioinspired_forearm"))
+
+def test_heavy_dependencies_load_on_first_use():
+    import os
+    import subprocess
+    import sys
+
+    script = ("import sys, kinematics, kinematics.workspace, actuation, control, control.gain_tuning, "
+              "visualization, interface.gui; "
+              "heavy = [m for m in ('matplotlib', 'tkinter', 'scipy') if m in sys.modules]; "
+              "assert not heavy, heavy; "
+              "from actuation import optimize_actuation; optimize_actuation(1.0, (1.0, 0.5)); "
+              "assert 'scipy' in sys.modules")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", script], cwd=root, check=True, capture_output=True)
+
+class _FakeRoot:
+    """Records root.after / after_cancel calls instead of running a Tk event loop."""
+    def __init__(self):
+        self.pending = {}
+        self.cancelled = []
+        self.scheduled = 0
+
+    def after(self, ms, callback):
+        self.scheduled += 1
+        job = f"after#{self.scheduled}"
+        self.pending[job] = callback
+        return job
+
+    def after_cancel(self, job):
+        self.cancelled.append(job)
+        self.pending.pop(job)
+
+    def run_pending(self):
+        job, callback = self.pending.popitem()
+        callback()
+
+def test_animation_scheduler_with_fake_root():
+    from interface.animation import AnimationScheduler
+
+    now = [0.0]
+    root = _FakeRoot()
+    frames, finished = [], []
+    anim = AnimationScheduler(root, frames.append, clock=lambda: now[0])
+    anim.play(np.arange(10) * 0.1, on_finish=lambda: finished.append(True))
+    assert frames == [0] and len(root.pending) == 1
+
+    # Llamar de nuevo a play o resume no arranca un segundo bucle
+    first = next(iter(root.pending))
+    anim.play(np.arange(10) * 0.1, on_finish=lambda: finished.append(True))
+    anim.resume()
+    assert root.cancelled == [first] and len(root.pending) == 1 and frames == [0, 0]
+
+    now[0] = 0.25
+    root.run_pending()
+    assert frames[-1] == 2 and anim.frames_dropped == 1 and len(root.pending) == 1
+
+    anim.pause()
+    assert not anim.playing and not root.pending and abs(anim.position - 0.25) < 1e-12
+    now[0] = 5.0  # el tiempo en pausa no cuenta
+    anim.resume()
+    assert frames[-1] == 2 and len(root.pending) == 1
+    now[0] = 5.5
+    root.run_pending()
+    assert frames[-1] == 7
+
+    anim.set_speed(2.0)
+    now[0] = 6.0
+    root.run_pending()
+    assert frames[-1] == 9 and finished == [True]
+    assert not anim.playing and not root.pending
+    anim.stop()
+    assert len(root.cancelled) == 2
@@ -0,0 +1,93 @@
+from collections import namedtuple
+import numpy as np
+from kinematics.kinematics import inverse_kinematics_2d_batch
+from interface.profile_io import ProfileWriter, CSV_HEADER
+
+PipelineStats = namedtuple("PipelineStats", ["samples_in", "samples_out", "unreachable", "over_limit"])
+
+class ArraySink:
+    """Collects the pipeline output in memory; result() returns an (N, 2) array."""
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, chunk):
+        self.chunks.append(chunk)
+
+    def close(self):
+        pass
+
+    def result(self):
+        return np.concatenate(self.chunks) if self.chunks else np.empty((0, 2))
+
+class CsvSink:
+    def __init__(self, path, header=CSV_HEADER):
+        """path may also be an open text stream such as sys.stdout, which is left open."""
+        self.owns_file = not hasattr(path, "write")
+        self.file = open(path, "w", newline="") if self.owns_file else path
+        self.file.write(",".join(header) + "\r\n")
+
+    def write(self, chunk):
+        # repr() keeps the values lossless, as in write_profile_csv
+        self.file.writelines(",".join(map(repr, row)) + "\r\n" for row in chunk.tolist())
+
+    def close(self):
+        if self.owns_file:
+            self.file.close()
+        else:
+            self.file.flush()
+
+class BinarySink(ProfileWriter):
+    """Writes the pipeline output as a binary profile (see ProfileWriter)."""
+
+class MovingAverage:
+    def __init__(self, window):
+        """Causal moving average over joint angles that carries its history across chunks."""
+        self.window = window
+        self.history = None
+
+    def __call__(self, chunk):
+        if len(chunk) == 0:
+            return chunk
+        if self.history is None:
+            # start from a window filled with the first sample: no jump at t = 0
+            self.history = np.repeat(chunk[:1], self.window - 1, axis=0)
+        values = np.concatenate([self.history, chunk])
+        cumsum = np.concatenate([np.zeros((1, values.shape[1])), np.cumsum(values, axis=0)])
+        self.history = values[len(values) - (self.window - 1):]
+        return (cumsum[self.window:] - cumsum[:-self.window]) / self.window
+
+def run_pipeline(source, sink, l1=1.0, l2=1.0, max_elbow_angle=np.pi, smoothing_window=None,
+                 initial=None):
+    """
+    Stream (x, y) target chunks through IK, the elbow-limit filter and smoothing into a sink.
+
+    source: iterable of (n, 2) target arrays, e.g. motion_profiles.circle_chunks.
+    sink: object with write(chunk) and close(), e.g. ArraySink, CsvSink or BinarySink.
+    Unreachable targets and solutions with |theta2| > max_elbow_angle become
+    NaN rows, so output row i always belongs to input sample i; smoothing
+    only runs over the valid samples. The IK branch and theta1 unwrapping
+    stay continuous across chunk boundaries, and memory use is bounded by
+    the chunk size. Returns PipelineStats; samples_out counts valid rows.
+    """
+    smoother = MovingAverage(smoothing_window) if smoothing_window and smoothing_window > 1 else None
+    samples_in = samples_out = unreachable = over_limit = 0
+    try:
+        for targets in source:
+            angles, reachable, _ = inverse_kinematics_2d_batch(targets, l1, l2, initial=initial)
+            if len(angles) == 0:
+                continue
+            initial = angles[-1]
+
+            within_limit = np.abs(angles[:, 1]) <= max_elbow_angle
+            keep = reachable & within_limit
+            samples_in += len(angles)
+            unreachable += int(np.count_nonzero(~reachable))
+            over_limit += int(np.count_nonzero(reachable & ~within_limit))
+
+            out = np.full_like(angles, np.nan)
+            out[keep] = smoother(angles[keep]) if smoother else angles[keep]
+            samples_out += int(np.count_nonzero(keep))
+            sink.write(out)
+    finally:
+        sink.close()
+    return PipelineStats(samples_in, samples_out, unreachable, over_limit)
@@ -0,0 +1 @@
+from kinematics.kinematics import ForearmKinematics, inverse_kinematics_2d, inverse_kinematics_2d_batch
@@ -0,0 +1,238 @@
+from collections import namedtuple
+import numpy as np
+
+_CONTACT_TOLERANCE = 1e-9  # m; touching segments count as colliding despite rounding
+
+ConstraintReport = namedtuple("ConstraintReport", ["first_violation", "violation", "joint_limit", "velocity",
+                                                   "acceleration", "self_collision", "obstacle"])
+
+def link_positions(trajectory, link_lengths):
+    """
+    Joint positions of a planar serial arm for every sample.
+
+    trajectory: (N, n_joints) relative joint angles in radians.
+    Returns (N, n_joints + 1, 2): the base at the origin, then every link end.
+    """
+    trajectory = np.asarray(trajectory, dtype=float)
+    absolute = np.cumsum(trajectory, axis=1)
+    points = np.zeros((len(trajectory), trajectory.shape[1] + 1, 2))
+    points[:, 1:, 0] = np.cumsum(link_lengths * np.cos(absolute), axis=1)
+    points[:, 1:, 1] = np.cumsum(link_lengths * np.sin(absolute), axis=1)
+    return points
+
+def _point_segment_distance(p, a, b):
+    ab = b - a
+    t = np.clip(np.einsum("...i,...i", p - a, ab) / np.maximum(np.einsum("...i,...i", ab, ab), 1e-300), 0.0, 1.0)
+    return np.linalg.norm(a + t[..., None] * ab - p, axis=-1)
+
+def _segment_distance(p1, q1, p2, q2):
+    """Minimum distance between segments p1-q1 and p2-q2 (closest-point method, non-degenerate segments)."""
+    d1 = q1 - p1
+    d2 = q2 - p2
+    r = p1 - p2
+    a = np.einsum("...i,...i", d1, d1)
+    e = np.einsum("...i,...i", d2, d2)
+    b = np.einsum("...i,...i", d1, d2)
+    c = np.einsum("...i,...i", d1, r)
+    f = np.einsum("...i,...i", d2, r)
+    denom = a * e - b * b
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = np.where(denom > 1e-12 * a * e, np.clip((b * f - c * e) / denom, 0.0, 1.0), 0.0)
+        t = (b * s + f) / e
+        s = np.where(t < 0.0, np.clip(-c / a, 0.0, 1.0), np.where(t > 1.0, np.clip((b - c) / a, 0.0, 1.0), s))
+    t = np.clip(t, 0.0, 1.0)
+    return np.linalg.norm(p1 + s[..., None] * d1 - p2 - t[..., None] * d2, axis=-1)
+
+def _segment_hits_box(a, b, lo, hi):
+    """Slab test: True where segment a-b touches the axis-aligned box [lo, hi]."""
+    d = b - a
+    t_enter = np.zeros(len(a))
+    t_exit = np.ones(len(a))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for axis in range(2):
+            t1 = (lo[:, axis] - a[:, axis]) / d[:, axis]
+            t2 = (hi[:, axis] - a[:, axis]) / d[:, axis]
+            parallel = d[:, axis] == 0
+            inside = (a[:, axis] >= lo[:, axis]) & (a[:, axis] <= hi[:, axis])
+            near = np.where(parallel, np.where(inside, -np.inf, np.inf), np.minimum(t1, t2))
+            far = np.where(parallel, np.where(inside, np.inf, -np.inf), np.maximum(t1, t2))
+            t_enter = np.maximum(t_enter, near)
+            t_exit = np.minimum(t_exit, far)
+    return t_enter <= t_exit
+
+def _expand_cells(lo, hi):
+    """For each row, every integer cell (ix, iy) in the inclusive range lo..hi. Returns (row, ix, iy)."""
+    span = hi - lo + 1
+    counts = span[:, 0] * span[:, 1]
+    rows = np.repeat(np.arange(len(lo)), counts)
+    local = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+    ix = lo[rows, 0] + local // span[rows, 1]
+    iy = lo[rows, 1] + local % span[rows, 1]
+    return rows, ix, iy
+
+def _cell_key(ix, iy):
+    return ix * (1 << 32) + iy
+
+class ObstacleIndex:
+    def __init__(self, circles=None, boxes=None, cell_size=None):
+        """
+        Static circle and box obstacles in a uniform-grid spatial index.
+
+        circles: (M, 3) rows of (cx, cy, radius). boxes: (K, 4) axis-aligned
+        rows of (xmin, ymin, xmax, ymax). Obstacle ids are 0..M-1 for the
+        circles, then M..M+K-1 for the boxes. Each obstacle is registered in
+        every grid cell its bounding box overlaps, so a query only tests the
+        obstacles sharing a cell with the query segment. cell_size defaults to
+        twice the median obstacle size.
+        """
+        self.circles = np.zeros((0, 3)) if circles is None else np.asarray(circles, dtype=float).reshape(-1, 3)
+        self.boxes = np.zeros((0, 4)) if boxes is None else np.asarray(boxes, dtype=float).reshape(-1, 4)
+        if np.any(self.boxes[:, 2:] < self.boxes[:, :2]):
+            raise ValueError("Boxes must be given as (xmin, ymin, xmax, ymax)")
+        radius = self.circles[:, 2:3]
+        self.bounds = np.vstack([np.hstack([self.circles[:, :2] - radius, self.circles[:, :2] + radius]),
+                                 self.boxes])
+        if cell_size is None:
+            sizes = np.max(self.bounds[:, 2:] - self.bounds[:, :2], axis=1)
+            cell_size = 2 * np.median(sizes) if len(sizes) and np.median(sizes) > 0 else 1.0
+        self.cell_size = float(cell_size)
+
+        lo = np.floor(self.bounds[:, :2] / self.cell_size).astype(np.int64)
+        hi = np.floor(self.bounds[:, 2:] / self.cell_size).astype(np.int64)
+        ids, ix, iy = _expand_cells(lo, hi)
+        keys = _cell_key(ix, iy)
+        order = np.argsort(keys, kind="stable")
+        self.cell_ids = ids[order]
+        self.cell_keys, self.cell_start, counts = np.unique(keys[order], return_index=True, return_counts=True)
+        self.cell_end = self.cell_start + counts
+
+    def __len__(self):
+        return len(self.bounds)
+
+    def candidate_pairs(self, start, end, radius=0.0):
+        """(segment, obstacle) pairs whose grid cells overlap; may contain duplicates."""
+        lo = np.floor((np.minimum(start, end) - radius) / self.cell_size).astype(np.int64)
+        hi = np.floor((np.maximum(start, end) + radius) / self.cell_size).astype(np.int64)
+        segments, ix, iy = _expand_cells(lo, hi)
+        keys = _cell_key(ix, iy)
+        if len(self.cell_keys) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(self.cell_keys, keys), len(self.cell_keys) - 1)
+        found = self.cell_keys[pos] == keys
+        segments, pos = segments[found], pos[found]
+        first, counts = self.cell_start[pos], self.cell_end[pos] - self.cell_start[pos]
+        pair_segments = np.repeat(segments, counts)
+        local = np.arange(len(pair_segments)) - np.repeat(np.cumsum(counts) - counts, counts)
+        return pair_segments, self.cell_ids[np.repeat(first, counts) + local]
+
+    def segment_hits(self, start, end, radius=0.0, chunk_size=65536):
+        """
+        True for every segment start[i]-end[i] (arrays of shape (S, 2)) that
+        comes within `radius` of an obstacle. Boxes are inflated by radius
+        along the axes, which is conservative at their corners. Work is done
+        in chunks of chunk_size pieces to bound memory.
+        """
+        start = np.asarray(start, dtype=float).reshape(-1, 2)
+        end = np.asarray(end, dtype=float).reshape(-1, 2)
+        # Long segments are split into cell-sized pieces, so a query visits the
+        # cells along the segment instead of every cell of its bounding box
+        pieces = np.maximum(np.ceil(np.linalg.norm(end - start, axis=1) / self.cell_size), 1).astype(np.int64)
+        owner = np.repeat(np.arange(len(start)), pieces)
+        k = np.arange(len(owner)) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+        step = (end - start)[owner] / pieces[owner, None]
+        piece_start = start[owner] + k[:, None] * step
+        piece_end = np.where((k + 1 == pieces[owner])[:, None], end[owner], piece_start + step)
+
+        hits = np.zeros(len(start), dtype=bool)
+        n_circles = len(self.circles)
+        for offset in range(0, len(owner), chunk_size):
+            a, b = piece_start[offset:offset + chunk_size], piece_end[offset:offset + chunk_size]
+            segments, obstacles = self.candidate_pairs(a, b, radius)
+            circle = obstacles < n_circles
+            s, o = segments[circle], obstacles[circle]
+            touching = (_point_segment_distance(self.circles[o, :2], a[s], b[s])
+                        <= self.circles[o, 2] + radius + _CONTACT_TOLERANCE)
+            hits[owner[offset + s[touching]]] = True
+            s, o = segments[~circle], obstacles[~circle] - n_circles
+            touching = _segment_hits_box(a[s], b[s], self.boxes[o, :2] - radius - _CONTACT_TOLERANCE,
+                                         self.boxes[o, 2:] + radius + _CONTACT_TOLERANCE)
+            hits[owner[offset + s[touching]]] = True
+        return hits
+
+class TrajectoryConstraints:
+    def __init__(self, link_lengths, joint_limits=None, max_velocity=None, max_acceleration=None,
+                 obstacles=None, link_radius=0.0, fold_margin=0.0):
+        """
+        Vectorized checks for whole (N, n_joints) joint-space trajectories of a planar arm.
+
+        joint_limits: (n_joints, 2) lower/upper angles in radians (the elbow
+        limit of ArmGUI.validate_elbow_angle is (-max, max) on the last row).
+        max_velocity / max_acceleration: per-joint bounds in rad/s and rad/s²,
+        scalars or (n_joints,). obstacles: an ObstacleIndex.
+        link_radius: half-thickness of the links, used for self-collision and
+        obstacle clearance. fold_margin: adjacent links collide when their
+        relative angle is within this many radians of folding back (|q| = pi).
+        """
+        self.link_lengths = np.asarray(link_lengths, dtype=float)
+        if np.any(self.link_lengths <= 0):
+            raise ValueError("Link lengths must be positive")
+        n = len(self.link_lengths)
+        self.joint_limits = None if joint_limits is None else np.broadcast_to(
+            np.asarray(joint_limits, dtype=float), (n, 2))
+        self.max_velocity = None if max_velocity is None else np.broadcast_to(np.asarray(max_velocity, dtype=float), (n,))
+        self.max_acceleration = None if max_acceleration is None else np.broadcast_to(
+            np.asarray(max_acceleration, dtype=float), (n,))
+        self.obstacles = obstacles
+        self.link_radius = float(link_radius)
+        self.fold_margin = float(fold_margin)
+        pairs = [(i, j) for i in range(n) for j in range(i + 2, n)]
+        self._link_pairs = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+
+    def check(self, trajectory, dt=None):
+        """
+        Check every sample of `trajectory` (N, n_joints) at once.
+
+        Velocity and acceleration use finite differences with sample spacing
+        dt (required when those limits are set): a velocity violation is
+        reported at the later sample of the pair, an acceleration violation
+        at the middle one. Returns a ConstraintReport of (N,) boolean masks,
+        their union `violation` and the index of the first violating sample
+        (-1 if the trajectory is valid).
+        """
+        q = np.asarray(trajectory, dtype=float)
+        if q.ndim != 2 or q.shape[1] != len(self.link_lengths):
+            raise ValueError(f"Expected a (N, {len(self.link_lengths)}) trajectory, got shape {q.shape}")
+        n_samples = len(q)
+        none = np.zeros(n_samples, dtype=bool)
+
+        joint_limit = none
+        if self.joint_limits is not None:
+            joint_limit = np.any((q < self.joint_limits[:, 0]) | (q > self.joint_limits[:, 1]), axis=1)
+
+        if (self.max_velocity is not None or self.max_acceleration is not None) and dt is None:
+            raise ValueError("dt is required to check velocity or acceleration limits")
+        velocity = acceleration = none
+        if self.max_velocity is not None and n_samples > 1:
+            velocity = np.zeros(n_samples, dtype=bool)
+            velocity[1:] = np.any(np.abs(np.diff(q, axis=0)) > self.max_velocity * dt, axis=1)
+        if self.max_acceleration is not None and n_samples > 2:
+            acceleration = np.zeros(n_samples, dtype=bool)
+            acceleration[1:-1] = np.any(np.abs(np.diff(q, n=2, axis=0)) > self.max_acceleration * dt * dt, axis=1)
+
+        points = link_positions(q, self.link_lengths)
+        # Adjacent links only collide when they fold back onto each other
+        self_collision = np.any(np.abs(np.angle(np.exp(1j * q[:, 1:]))) >= np.pi - self.fold_margin, axis=1)
+        if len(self._link_pairs):
+            i, j = self._link_pairs[:, 0], self._link_pairs[:, 1]
+            distance = _segment_distance(points[:, i], points[:, i + 1], points[:, j], points[:, j + 1])
+            self_collision |= np.any(distance <= 2 * self.link_radius + _CONTACT_TOLERANCE, axis=1)
+
+        obstacle = none
+        if self.obstacles is not None and len(self.obstacles):
+            hits = self.obstacles.segment_hits(points[:, :-1].reshape(-1, 2), points[:, 1:].reshape(-1, 2),
+                                               self.link_radius)
+            obstacle = hits.reshape(n_samples, -1).any(axis=1)
+
+        violation = joint_limit | velocity | acceleration | self_collision | obstacle
+        first = int(np.argmax(violation)) if violation.any() else -1
+        return ConstraintReport(first, violation, joint_limit, velocity, acceleration, self_collision, obstacle)
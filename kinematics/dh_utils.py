@@ -7,4 +7,40 @@ def dh_transform(a, alpha, d, theta):
         [np.sin(theta),  np.cos(theta)*np.cos(alpha), -np.cos(theta)*np.sin(alpha), a*np.sin(theta)],
         [0,              np.sin(alpha),                np.cos(alpha),               d],
         [0,              0,                            0,                           1]
-    ])
\ No newline at end of file
+    ])
+
+def dh_transform_batch(a, alpha, d, theta, out=None):
+    """
+    Compute stacked Denavit-Hartenberg matrices in one vectorized pass.
+
+    a, alpha, d and theta broadcast against each other; the result has shape
+    broadcast_shape + (4, 4). Each entry is evaluated with the same expression
+    as dh_transform, so both paths agree exactly. If out is given it is filled
+    in place instead of allocating a new array.
+    """
+    a = np.asarray(a, dtype=float)
+    alpha = np.asarray(alpha, dtype=float)
+    d = np.asarray(d, dtype=float)
+    theta = np.asarray(theta, dtype=float)
+    shape = np.broadcast_shapes(a.shape, alpha.shape, d.shape, theta.shape)
+    if out is None:
+        out = np.empty(shape + (4, 4))
+
+    ct, st = np.cos(theta), np.sin(theta)
+    ca, sa = np.cos(alpha), np.sin(alpha)
+
+    out[..., 0, 0] = ct
+    np.multiply(-st, ca, out=out[..., 0, 1])
+    np.multiply(st, sa, out=out[..., 0, 2])
+    np.multiply(a, ct, out=out[..., 0, 3])
+    out[..., 1, 0] = st
+    np.multiply(ct, ca, out=out[..., 1, 1])
+    np.multiply(-ct, sa, out=out[..., 1, 2])
+    np.multiply(a, st, out=out[..., 1, 3])
+    out[..., 2, 0] = 0
+    out[..., 2, 1] = sa
+    out[..., 2, 2] = ca
+    out[..., 2, 3] = d
+    out[..., 3, :3] = 0
+    out[..., 3, 3] = 1
+    return out
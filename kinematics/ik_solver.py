@@ -0,0 +1,79 @@
+from collections import namedtuple
+import numpy as np
+from kinematics.kinematics import jacobian_from_frames
+
+IKResult = namedtuple("IKResult", ["joint_angles", "converged", "iterations", "error"])
+
+def _pose_error(T, targets):
+    """Stacked task-space error; position only for (N, 3) targets, else position + orientation."""
+    pos_err = targets[:, :3, 3] - T[:, :3, 3] if targets.ndim == 3 else targets - T[:, :3, 3]
+    if targets.ndim == 2:
+        return pos_err
+    # 0.5 * sum_k (r_k x r_k^d) over the rotation matrix columns
+    rot_err = 0.5 * np.cross(T[:, :3, :3], targets[:, :3, :3], axis=1).sum(axis=2)
+    return np.concatenate([pos_err, rot_err], axis=1)
+
+def solve_ik_batch(kinematics, targets, initial, damping=0.05, tol=1e-6, max_iter=100):
+    """
+    Damped least squares IK for any DH chain, solving N independent targets at once.
+
+    kinematics: ForearmKinematics whose joint angles replace the DH theta column.
+    targets: (N, 3) end-effector positions, or (N, 4, 4) poses to also match
+    orientation (e.g. wrist pronation/supination chains).
+    initial: starting joint angles, shape (n_joints,) or (N, n_joints).
+
+    Every iteration evaluates the frames and analytic Jacobians of all targets
+    that have not yet converged in one vectorized pass. Returns an IKResult with
+    per-target joint angles, convergence flags, iteration counts and final error.
+    """
+    targets = np.asarray(targets, dtype=float)
+    pose = targets.ndim == 3
+    n_targets = len(targets)
+    n_joints = len(kinematics.dh_params)
+    m = 6 if pose else 3
+
+    q = np.array(np.broadcast_to(np.asarray(initial, dtype=float), (n_targets, n_joints)))
+    iterations = np.zeros(n_targets, dtype=int)
+    error = np.full(n_targets, np.inf)
+    active = np.arange(n_targets)
+    damping_eye = damping**2 * np.eye(m)
+
+    for it in range(max_iter + 1):
+        frames = kinematics.forward_kinematics_batch(q[active], return_frames=True)
+        err = _pose_error(frames[:, -1], targets[active])
+        error[active] = np.linalg.norm(err, axis=1)
+        pending = error[active] >= tol
+        if it == max_iter or not pending.any():
+            break
+
+        active = active[pending]
+        J = jacobian_from_frames(frames[pending])[:, :m]
+        Jt = J.transpose(0, 2, 1)
+        # dq = J^T (J J^T + lambda^2 I)^-1 e
+        step = np.linalg.solve(J @ Jt + damping_eye, err[pending][..., np.newaxis])
+        q[active] += (Jt @ step)[..., 0]
+        iterations[active] += 1
+
+    return IKResult(q, error < tol, iterations, error)
+
+def solve_ik_trajectory(kinematics, targets, initial, **kwargs):
+    """
+    Solve IK along a path, warm-starting every point from the previous solution.
+
+    Accepts the same targets and keyword arguments as solve_ik_batch and
+    returns an IKResult with one entry per path point.
+    """
+    targets = np.asarray(targets, dtype=float)
+    n_targets = len(targets)
+    q = np.empty((n_targets, len(kinematics.dh_params)))
+    converged = np.empty(n_targets, dtype=bool)
+    iterations = np.empty(n_targets, dtype=int)
+    error = np.empty(n_targets)
+
+    guess = np.asarray(initial, dtype=float)
+    for i in range(n_targets):
+        result = solve_ik_batch(kinematics, targets[i:i + 1], guess, **kwargs)
+        q[i], converged[i], iterations[i], error[i] = (
+            result.joint_angles[0], result.converged[0], result.iterations[0], result.error[0])
+        guess = q[i]
+    return IKResult(q, converged, iterations, error)
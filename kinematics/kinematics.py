@@ -1,4 +1,4 @@
-from kinematics.dh_utils import dh_transform
+from kinematics.dh_utils import dh_transform, dh_transform_batch
 import numpy as np
 
 class ForearmKinematics:
@@ -14,6 +14,55 @@ class ForearmKinematics:
         for a, alpha, d, theta in self.dh_params:
             T = T @ dh_transform(a, alpha, d, theta)
         return T
+
+    def forward_kinematics_batch(self, joint_angles, return_frames=False):
+        """
+        Compute the final transformation matrix for many joint configurations.
+
+        joint_angles: array of shape (N, n_joints); column i replaces the theta
+        of the i-th DH row. Returns an (N, 4, 4) array, or the (N, n_joints, 4, 4)
+        cumulative frames T_0^1 ... T_0^n when return_frames is True.
+        """
+        params = np.asarray(self.dh_params, dtype=float).reshape(-1, 4)
+        q = np.asarray(joint_angles, dtype=float)
+        if q.ndim != 2 or q.shape[1] != len(params):
+            raise ValueError(f"joint_angles must have shape (N, {len(params)})")
+
+        # (N, n_joints, 4, 4); the cumulative products are written in place
+        frames = dh_transform_batch(params[:, 0], params[:, 1], params[:, 2], q)
+        for i in range(1, len(params)):
+            np.matmul(frames[:, i - 1], frames[:, i], out=frames[:, i])
+
+        if return_frames:
+            return frames
+        return frames[:, -1].copy()
+
+    def jacobian_batch(self, joint_angles):
+        """
+        Geometric Jacobian of the end effector for many joint configurations.
+
+        All joints are revolute about the DH z axes. Returns an (N, 6, n_joints)
+        array: rows 0-2 map joint rates to linear velocity, rows 3-5 to angular
+        velocity.
+        """
+        return jacobian_from_frames(self.forward_kinematics_batch(joint_angles, return_frames=True))
+
+def jacobian_from_frames(frames):
+    """Geometric Jacobian from the (N, n_joints, 4, 4) cumulative DH frames."""
+    n_samples, n_joints = frames.shape[:2]
+    # joint i rotates about z_{i-1}, located at the origin of frame i-1
+    z = np.empty((n_samples, n_joints, 3))
+    p = np.empty((n_samples, n_joints, 3))
+    z[:, 0] = (0, 0, 1)
+    p[:, 0] = 0
+    z[:, 1:] = frames[:, :-1, :3, 2]
+    p[:, 1:] = frames[:, :-1, :3, 3]
+    end = frames[:, -1, np.newaxis, :3, 3]
+
+    J = np.empty((n_samples, 6, n_joints))
+    J[:, :3] = np.cross(z, end - p).transpose(0, 2, 1)
+    J[:, 3:] = z.transpose(0, 2, 1)
+    return J
 def inverse_kinematics_2d(x, y, l1, l2):
     """Inverse kinematics for a planar 2-link arm."""
     cos_theta2 = (x**2 + y**2 - l1**2 - l2**2) / (2 * l1 * l2)
@@ -26,4 +75,91 @@ def inverse_kinematics_2d(x, y, l1, l2):
     k2 = l2 * sin_theta2
     theta1 = np.arctan2(y, x) - np.arctan2(k2, k1)
 
-    return theta1, theta2
\ No newline at end of file
+    return theta1, theta2
+
+def inverse_kinematics_2d_batch(targets, l1, l2, initial=None):
+    """
+    Vectorized inverse kinematics for a planar 2-link arm.
+
+    targets: array of shape (N, 2) with (x, y) positions, usually a sampled path.
+    initial: optional (theta1, theta2) the arm starts from; the first branch is
+    chosen closest to it, otherwise the first point uses the same branch as
+    inverse_kinematics_2d.
+
+    Returns (angles, reachable, branches):
+      angles    -- (N, 2) joint angles, switching branch only when it keeps the
+                   joint motion continuous, with theta1 unwrapped along the path.
+      reachable -- (N,) boolean mask. Unreachable targets never raise; they get
+                   the pose pointing the arm towards the target.
+      branches  -- (N, 2, 2) both solutions per target; branch 0 is the
+                   elbow-down solution (theta2 >= 0) returned by
+                   inverse_kinematics_2d, branch 1 the elbow-up mirror.
+    """
+    targets = np.asarray(targets, dtype=float).reshape(-1, 2)
+    x, y = targets[:, 0], targets[:, 1]
+    n = len(targets)
+
+    cos_theta2 = (x**2 + y**2 - l1**2 - l2**2) / (2 * l1 * l2)
+    with np.errstate(invalid='ignore'):
+        reachable = np.abs(cos_theta2) <= 1
+    cos_theta2 = np.clip(cos_theta2, -1, 1)
+    sin_theta2 = np.sqrt(1 - cos_theta2**2)
+
+    theta2 = np.arctan2(sin_theta2, cos_theta2)
+    k1 = l1 + l2 * cos_theta2
+    k2 = l2 * sin_theta2
+    base = np.arctan2(y, x)
+    offset = np.arctan2(k2, k1)
+
+    branches = np.empty((n, 2, 2))
+    branches[:, 0, 0] = base - offset
+    branches[:, 0, 1] = theta2
+    branches[:, 1, 0] = base + offset
+    branches[:, 1, 1] = -theta2
+    if n == 0:
+        return np.empty((0, 2)), reachable, branches
+
+    choice = _continuous_branch_choice(branches, initial)
+    angles = branches[np.arange(n), choice]
+    if initial is None:
+        angles[:, 0] = np.unwrap(angles[:, 0])
+    else:
+        angles[:, 0] = np.unwrap(np.concatenate(([initial[0]], angles[:, 0])))[1:]
+    return angles, reachable, branches
+
+def _joint_distance(a, b):
+    """Squared joint-space distance with theta1 compared modulo 2*pi."""
+    d1 = np.angle(np.exp(1j * (a[..., 0] - b[..., 0])))
+    d2 = a[..., 1] - b[..., 1]
+    return d1**2 + d2**2
+
+def _continuous_branch_choice(branches, initial):
+    """
+    Pick, for every sample, the branch nearest to the previous pick.
+
+    Each step maps the previous branch to the next one through one of four
+    maps on {0, 1}: keep, swap, or reset to a constant. The greedy chain is
+    then resolved without a Python loop by counting swaps since the last reset.
+    """
+    n = len(branches)
+    # dist[i, p, b]: distance from branch p at sample i-1 to branch b at sample i
+    dist = _joint_distance(branches[1:, np.newaxis, :, :], branches[:-1, :, np.newaxis, :])
+    stay = np.stack([dist[:, 0, 0] <= dist[:, 0, 1], dist[:, 1, 1] <= dist[:, 1, 0]], axis=1)
+    best = np.where(stay, [0, 1], [1, 0])
+
+    reset = np.empty(n, dtype=bool)
+    value = np.empty(n, dtype=int)
+    swap = np.zeros(n, dtype=int)
+    reset[0] = True
+    if initial is None:
+        value[0] = 0
+    else:
+        d_init = _joint_distance(branches[0], np.asarray(initial, dtype=float))
+        value[0] = int(d_init[1] < d_init[0])
+    reset[1:] = best[:, 0] == best[:, 1]
+    value[1:] = best[:, 0]
+    swap[1:] = (best[:, 0] == 1) & (best[:, 1] == 0)
+
+    last_reset = np.maximum.accumulate(np.where(reset, np.arange(n), 0))
+    swaps = np.cumsum(swap)
+    return value[last_reset] ^ ((swaps - swaps[last_reset]) & 1)
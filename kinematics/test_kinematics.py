@@ -1,4 +1,4 @@
-from kinematics import ForearmKinematics
+from kinematics import ForearmKinematics, inverse_kinematics_2d, inverse_kinematics_2d_batch
 import numpy as np
 
 def test_forward_kinematics_identity():
@@ -9,3 +9,134 @@ def test_forward_kinematics_identity():
     T = fk.forward_kinematics()
     assert np.allclose(T[0:3, 3], [1, 0, 0])
 
+def test_forward_kinematics_batch_matches_scalar():
+    dh = [(0.3, np.pi / 2, 0.1, 0), (1.0, 0, 0, 0), (0.8, -np.pi / 2, 0.05, 0)]
+    q = np.random.default_rng(0).uniform(-np.pi, np.pi, (200, 3))
+    T = ForearmKinematics(dh).forward_kinematics_batch(q)
+    for row, T_batch in zip(q, T):
+        params = [(a, alpha, d, theta) for (a, alpha, d, _), theta in zip(dh, row)]
+        assert np.array_equal(T_batch, ForearmKinematics(params).forward_kinematics())
+
+def test_forward_kinematics_batch_frames():
+    fk = ForearmKinematics([(1, 0, 0, 0), (1, 0, 0, 0)])
+    frames = fk.forward_kinematics_batch([[0, np.pi / 2]], return_frames=True)
+    assert frames.shape == (1, 2, 4, 4)
+    assert np.allclose(frames[0, 0, 0:3, 3], [1, 0, 0])
+    assert np.allclose(frames[0, 1, 0:3, 3], [1, 1, 0])
+
+def test_inverse_kinematics_2d_batch_matches_scalar():
+    targets = np.random.default_rng(1).uniform(-2.5, 2.5, (300, 2))
+    angles, reachable, branches = inverse_kinematics_2d_batch(targets, 1.0, 1.0)
+    assert angles.shape == (300, 2) and branches.shape == (300, 2, 2)
+    for (x, y), ok, solutions in zip(targets, reachable, branches):
+        try:
+            expected = inverse_kinematics_2d(x, y, 1.0, 1.0)
+        except ValueError:
+            assert not ok
+        else:
+            assert ok
+            assert np.allclose(solutions[0], expected)
+            assert np.isclose(solutions[1, 1], -expected[1])
+
+def test_inverse_kinematics_2d_batch_continuous_path():
+    t = np.linspace(0, 4 * np.pi, 2000)
+    path = np.column_stack([0.5 + 1.2 * np.cos(t), 1.2 * np.sin(t)])
+    angles, reachable, _ = inverse_kinematics_2d_batch(path, 1.0, 1.0)
+    assert reachable.all()
+    assert np.abs(np.diff(angles, axis=0)).max() < 0.05
+
+def test_workspace_grid_lookup_and_cache(tmp_path):
+    from kinematics.workspace import WorkspaceGrid
+    grid = WorkspaceGrid(1.0, 1.0, max_elbow_angle=np.deg2rad(150), cache_dir=str(tmp_path))
+    assert grid.is_reachable(1.0, 1.0)
+    assert not grid.is_reachable(0.1, 0.0)  # inside the elbow-limit hole
+    assert not grid.is_reachable(3.0, 0.0)
+    nx, ny = grid.nearest_reachable(3.0, 0.0)
+    assert grid.is_reachable(nx, ny) and np.hypot(nx, ny) > 1.95
+
+    cached = WorkspaceGrid(1.0, 1.0, max_elbow_angle=np.deg2rad(150), cache_dir=str(tmp_path))
+    assert len(list(tmp_path.iterdir())) == 1
+    points = np.random.default_rng(2).uniform(-2.5, 2.5, (100, 2))
+    assert np.array_equal(cached.is_reachable(points[:, 0], points[:, 1]),
+                          grid.is_reachable(points[:, 0], points[:, 1]))
+
+def test_workspace_agrees_with_analytic_ik_near_boundary():
+    from kinematics.workspace import WorkspaceGrid
+    limit = np.deg2rad(150)
+    grid = WorkspaceGrid(1.0, 1.0, max_elbow_angle=limit, resolution=0.05)
+    # puntos repartidos justo alrededor de los radios interior y exterior
+    rng = np.random.default_rng(7)
+    inner = np.sqrt(2 + 2 * np.cos(limit))
+    radius = np.concatenate([inner + rng.uniform(-0.03, 0.03, 2000), 2.0 + rng.uniform(-0.03, 0.03, 2000)])
+    angle = rng.uniform(-np.pi, np.pi, radius.size)
+    x, y = radius * np.cos(angle), radius * np.sin(angle)
+
+    expected = []
+    for xi, yi in zip(x, y):
+        try:
+            expected.append(inverse_kinematics_2d(xi, yi, 1.0, 1.0)[1] <= limit)
+        except ValueError:
+            expected.append(False)
+    assert np.array_equal(grid.is_reachable(x, y), expected)
+    assert grid.is_reachable(0.0983, -1.99986) == (np.hypot(0.0983, -1.99986) <= 2.0)
+
+    nx, ny = grid.nearest_reachable(x, y)
+    assert grid.is_reachable(nx, ny).all()
+
+def test_numerical_ik_batch_and_trajectory():
+    from kinematics.ik_solver import solve_ik_batch, solve_ik_trajectory
+    # shoulder, elbow and wrist pronation/supination
+    fk = ForearmKinematics([(0, np.pi / 2, 0.3, 0), (1.0, 0, 0, 0), (0, np.pi / 2, 0, 0), (0, 0, 0.8, 0)])
+    q_true = np.random.default_rng(3).uniform(-1, 1, (50, 4))
+    poses = fk.forward_kinematics_batch(q_true)
+    result = solve_ik_batch(fk, poses, np.full(4, 0.1), max_iter=200)
+    assert result.converged.all()
+    assert np.allclose(fk.forward_kinematics_batch(result.joint_angles), poses, atol=1e-5)
+
+    path = fk.forward_kinematics_batch(np.linspace(0, 1, 50)[:, np.newaxis] * [1, 0.5, -0.7, 0.9])
+    warm = solve_ik_trajectory(fk, path, np.zeros(4))
+    assert warm.converged.all()
+    assert warm.iterations.mean() < solve_ik_batch(fk, path, np.zeros(4)).iterations.mean()
+
+def test_trajectory_constraints_masks():
+    from kinematics.constraints import ObstacleIndex, TrajectoryConstraints
+
+    q = np.tile([0.0, np.pi / 2], (40, 1))
+    q[5, 1] = 2.9                      # over the elbow limit
+    q[10:, 0] += 0.2                   # velocity step between samples 9 and 10
+    q[20] = [-np.pi / 2, np.pi / 2]    # link 1 sweeps through the box below the base
+    obstacles = ObstacleIndex(circles=[(-3.0, -3.0, 0.1)], boxes=[(-0.1, -1.5, 0.1, -1.0)])
+    constraints = TrajectoryConstraints([1.0, 1.0], joint_limits=[(-np.pi, np.pi), (-2.5, 2.5)],
+                                        max_velocity=1.0, obstacles=obstacles)
+    report = constraints.check(q, dt=0.1)
+    assert report.first_violation == 5
+    assert list(np.flatnonzero(report.joint_limit)) == [5]
+    assert list(np.flatnonzero(report.velocity)) == [5, 6, 10, 20, 21]
+    assert list(np.flatnonzero(report.obstacle)) == [20]
+    assert not report.self_collision.any() and not report.acceleration.any()
+    assert constraints.check(q[25:], dt=0.1).first_violation == -1
+
+    # Brazo de tres eslabones: el tercero se cruza con el primero
+    three = TrajectoryConstraints([1.0, 1.0, 1.0], fold_margin=0.05)
+    report = three.check([[0.0, 2.5, 2.5], [0.0, 0.5, 0.5], [0.0, 3.12, 0.0]])
+    assert list(report.self_collision) == [True, False, True]
+
+def test_obstacle_index_matches_brute_force():
+    from kinematics.constraints import ObstacleIndex, _point_segment_distance, _segment_hits_box
+
+    rng = np.random.default_rng(3)
+    circles = np.column_stack([rng.uniform(-3, 3, (300, 2)), rng.uniform(0.02, 0.1, 300)])
+    corners = rng.uniform(-3, 3, (200, 2))
+    boxes = np.hstack([corners, corners + rng.uniform(0.02, 0.2, (200, 2))])
+    index = ObstacleIndex(circles, boxes)
+    start = rng.uniform(-2.5, 2.5, (500, 2))
+    end = start + rng.uniform(-1.0, 1.0, (500, 2))
+
+    hits = index.segment_hits(start, end, radius=0.03, chunk_size=97)
+    a = np.repeat(start, 200, axis=0)
+    b = np.repeat(end, 200, axis=0)
+    expected = (np.any(_point_segment_distance(circles[None, :, :2], start[:, None], end[:, None])
+                       <= circles[:, 2] + 0.03, axis=1)
+                | _segment_hits_box(a, b, np.tile(boxes[:, :2] - 0.03, (500, 1)),
+                                    np.tile(boxes[:, 2:] + 0.03, (500, 1))).reshape(500, 200).any(axis=1))
+    assert np.array_equal(hits, expected) and 0 < hits.sum() < 500
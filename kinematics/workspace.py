@@ -0,0 +1,118 @@
+import hashlib
+import os
+import numpy as np
+from kinematics.kinematics import inverse_kinematics_2d_batch
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "bioinspired_forearm")
+_FORMAT_VERSION = 2
+
+def _wrap_within(theta, limits):
+    """True where theta lies inside the (lo, hi) interval, modulo 2*pi."""
+    lo, hi = limits
+    if hi - lo >= 2 * np.pi:
+        return np.ones(np.shape(theta), dtype=bool)
+    return np.mod(theta - lo, 2 * np.pi) <= hi - lo
+
+def is_reachable(x, y, l1, l2, max_elbow_angle=np.pi, theta1_limits=(-np.pi, np.pi)):
+    """
+    Analytic reachability test under joint limits; x and y may be arrays.
+
+    Identical to solving inverse_kinematics_2d and checking the limits, and
+    needs no grid, so single targets can be checked without building one.
+    """
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    _, reachable, branches = inverse_kinematics_2d_batch(np.column_stack([x.ravel(), y.ravel()]), l1, l2)
+    elbow_ok = np.abs(branches[:, 0, 1]) <= max_elbow_angle
+    shoulder_ok = (_wrap_within(branches[:, 0, 0], theta1_limits)
+                   | _wrap_within(branches[:, 1, 0], theta1_limits))
+    result = (reachable & elbow_ok & shoulder_ok).reshape(x.shape)
+    return bool(result) if result.ndim == 0 else result
+
+class WorkspaceGrid:
+    def __init__(self, l1, l2, max_elbow_angle=np.pi, theta1_limits=(-np.pi, np.pi),
+                 resolution=0.01, cache_dir=None):
+        """
+        Nearest-reachable-point map of a planar 2-link arm under joint limits.
+
+        max_elbow_angle: limit on |theta2| in radians (see ArmGUI.validate_elbow_angle).
+        theta1_limits: (lo, hi) shoulder range in radians.
+        resolution: cell size in meters; a cell is reachable when its center is,
+        and every cell stores the closest reachable cell.
+        cache_dir: if given, the grid is loaded from / saved to this directory,
+        keyed by the configuration, so it is only built once.
+        """
+        self.l1 = float(l1)
+        self.l2 = float(l2)
+        self.max_elbow_angle = float(max_elbow_angle)
+        self.theta1_limits = (float(theta1_limits[0]), float(theta1_limits[1]))
+        self.resolution = float(resolution)
+        self.extent = self.l1 + self.l2 + self.resolution
+        self.size = int(np.ceil(2 * self.extent / self.resolution))
+
+        path = os.path.join(cache_dir, self.cache_key() + ".npz") if cache_dir else None
+        if path and os.path.exists(path):
+            with np.load(path) as data:
+                self.nearest = data["nearest"]
+        else:
+            self._build()
+            if path:
+                self._save(path)
+
+    def cache_key(self):
+        """Identifier of the link-length / joint-limit configuration."""
+        config = (_FORMAT_VERSION, self.l1, self.l2, self.max_elbow_angle,
+                  self.theta1_limits, self.resolution)
+        return "workspace-" + hashlib.sha1(repr(config).encode()).hexdigest()[:16]
+
+    def cell_centers(self):
+        """Return the x and y coordinates of the cell centers along each axis."""
+        return -self.extent + (np.arange(self.size) + 0.5) * self.resolution
+
+    def _build(self):
+        from scipy.ndimage import distance_transform_edt
+
+        c = self.cell_centers()
+        gx, gy = np.meshgrid(c, c, indexing="ij")
+        occupancy = self.is_reachable(gx, gy)
+        if not occupancy.any():
+            raise ValueError("Workspace is empty for these joint limits")
+
+        # For every cell, the index of the closest reachable cell
+        _, nearest = distance_transform_edt(~occupancy, return_indices=True)
+        self.nearest = nearest.astype(np.int32)
+
+    def _save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, nearest=self.nearest)
+        os.replace(tmp, path)
+
+    def _cells(self, x, y):
+        ix = np.floor((np.asarray(x, dtype=float) + self.extent) / self.resolution)
+        iy = np.floor((np.asarray(y, dtype=float) + self.extent) / self.resolution)
+        inside = (ix >= 0) & (ix < self.size) & (iy >= 0) & (iy < self.size)
+        ix = np.clip(np.nan_to_num(ix, nan=-1), 0, self.size - 1).astype(np.intp)
+        iy = np.clip(np.nan_to_num(iy, nan=-1), 0, self.size - 1).astype(np.intp)
+        return ix, iy, inside
+
+    def is_reachable(self, x, y):
+        """Reachability under this grid's configuration (the analytic is_reachable, not a cell lookup)."""
+        return is_reachable(x, y, self.l1, self.l2, self.max_elbow_angle, self.theta1_limits)
+
+    def nearest_reachable(self, x, y):
+        """
+        Return the closest reachable point to (x, y); x and y may be arrays.
+
+        Reachable targets are returned unchanged, others are snapped to the
+        center of the nearest reachable cell (cell centers are classified with
+        the exact test, so the result is always reachable).
+        """
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        ix, iy, _ = self._cells(x, y)
+        reachable = np.asarray(self.is_reachable(x, y))
+        c = self.cell_centers()
+        nx = np.where(reachable, x, c[self.nearest[0, ix, iy]])
+        ny = np.where(reachable, y, c[self.nearest[1, ix, iy]])
+        if nx.ndim == 0:
+            return float(nx), float(ny)
+        return nx, ny
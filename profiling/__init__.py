@@ -0,0 +1,2 @@
+from profiling.instrumentation import (TARGETS, enable, disable, is_enabled, patched, reset, snapshot, dump_json,
+                                       dump_chrome_trace)
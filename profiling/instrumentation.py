@@ -0,0 +1,218 @@
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+import numpy as np
+
+# name -> (module, attribute path); the plotters are only patched once something imports them
+TARGETS = {
+    "forward_kinematics": ("kinematics.kinematics", "ForearmKinematics.forward_kinematics"),
+    "inverse_kinematics_2d": ("kinematics.kinematics", "inverse_kinematics_2d"),
+    "PIDController.compute": ("control.pid_controller", "PIDController.compute"),
+    "optimize_actuation": ("actuation.actuation_optimizer", "optimize_actuation"),
+    "ArmPlot2D.update": ("visualization.arm_plotter", "ArmPlot2D.update"),
+    "ArmPlot3D.update": ("visualization.arm_plotter_3d", "ArmPlot3D.update"),
+}
+LAZY_MODULES = ("visualization.arm_plotter", "visualization.arm_plotter_3d")
+
+class CallStats:
+    __slots__ = ("count", "total", "max", "samples")
+
+    def __init__(self, window):
+        """Call count, cumulative and max time, plus the last `window` durations for percentiles."""
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=window)
+
+    def summary(self):
+        samples = np.fromiter(self.samples, dtype=float, count=len(self.samples))
+        p50, p90, p99 = np.percentile(samples, [50, 90, 99]) if len(samples) else (0.0, 0.0, 0.0)
+        return {"count": self.count, "total": self.total, "mean": self.total / self.count if self.count else 0.0,
+                "max": self.max, "p50": float(p50), "p90": float(p90), "p99": float(p99)}
+
+class _State:
+    def __init__(self):
+        self.enabled = False
+        self.stats = {}
+        self.trace = None
+        self.origin = time.perf_counter()
+        self.window = 10000
+        self.patches = []  # (owner, attribute, original, wrapper)
+        self.rebinds = []  # (module name, attribute) of other bindings swapped for a wrapper
+        self.wrappers = {}  # id(wrapper) -> (wrapper, original)
+        self.pending = {}  # module -> [(name, attribute path)]
+        self.lock = threading.Lock()
+
+_state = _State()
+
+def _timed(name, fn):
+    stats = _state.stats.setdefault(name, CallStats(_state.window))
+    trace = _state.trace
+    clock = time.perf_counter
+
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = clock() - start
+            stats.count += 1
+            stats.total += elapsed
+            stats.samples.append(elapsed)
+            if elapsed > stats.max:
+                stats.max = elapsed
+            if trace is not None:
+                trace.append((name, start, elapsed, threading.get_ident()))
+    wrapper.__name__ = fn.__name__
+    wrapper.__qualname__ = fn.__qualname__
+    wrapper.__doc__ = fn.__doc__
+    wrapper.__wrapped__ = fn
+    return wrapper
+
+def _patch(name, module_name, path):
+    module = sys.modules[module_name]
+    *owners, attribute = path.split(".")
+    owner = module
+    for part in owners:
+        owner = getattr(owner, part)
+    original = getattr(owner, attribute)
+    wrapper = _timed(name, original)
+    setattr(owner, attribute, wrapper)
+    _state.patches.append((owner, attribute, original, wrapper))
+    _state.wrappers[id(wrapper)] = (wrapper, original)
+    # copies made by `from ... import`, under any name; modules imported later get the wrapper
+    _state.rebinds.extend(_rebind({id(original): (original, wrapper)}))
+
+def _rebind(replacements):
+    """
+    Swap module globals that are (by identity) one of the replaced objects.
+
+    replacements maps id(old) -> (old, new). Returns the (module name,
+    attribute) pairs that were changed.
+    """
+    changed = []
+    for module_name, module in list(sys.modules.items()):
+        namespace = getattr(module, "__dict__", None)
+        if not isinstance(namespace, dict):
+            continue
+        for attribute, value in list(namespace.items()):
+            replacement = replacements.get(id(value))
+            if replacement is not None and replacement[0] is value:
+                namespace[attribute] = replacement[1]
+                changed.append((module_name, attribute))
+    return changed
+
+class _PatchAfterImport:
+    """meta_path finder that applies pending patches right after a target module is imported."""
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname not in _state.pending:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        exec_module = spec.loader.exec_module
+
+        def exec_and_patch(module):
+            exec_module(module)
+            with _state.lock:
+                for name, attribute_path in _state.pending.pop(fullname, []):
+                    _patch(name, fullname, attribute_path)
+        spec.loader.exec_module = exec_and_patch
+        return spec
+
+_finder = _PatchAfterImport()
+
+def enable(targets=None, trace=False, window=10000, trace_limit=1_000_000):
+    """
+    Start timing the instrumented functions (all of TARGETS by default).
+
+    The functions are swapped for timing wrappers only while enabled, so
+    disabled instrumentation costs nothing. Module globals that are the very
+    same function object (e.g. bound by `from kinematics import
+    inverse_kinematics_2d`) are swapped too, found by identity in
+    sys.modules; patched() lists every binding that was replaced. Targets in
+    modules that are not imported yet (the matplotlib plotters) are patched
+    when first imported.
+    window: durations kept per function for percentiles. trace: also keep
+    up to trace_limit individual calls for dump_chrome_trace().
+    """
+    with _state.lock:
+        if _state.enabled:
+            raise RuntimeError("instrumentation is already enabled")
+        _state.window = window
+        _state.trace = deque(maxlen=trace_limit) if trace else None
+        _state.origin = time.perf_counter()
+        for name in (TARGETS if targets is None else targets):
+            module_name, path = TARGETS[name]
+            if module_name in LAZY_MODULES and module_name not in sys.modules:
+                _state.pending.setdefault(module_name, []).append((name, path))
+                continue
+            importlib.import_module(module_name)
+            _patch(name, module_name, path)
+        if _state.pending and _finder not in sys.meta_path:
+            sys.meta_path.insert(0, _finder)
+        _state.enabled = True
+
+def disable():
+    """Restore the original functions; collected statistics stay available."""
+    with _state.lock:
+        for owner, attribute, original, wrapper in reversed(_state.patches):
+            if getattr(owner, attribute, None) is wrapper:
+                setattr(owner, attribute, original)
+        # also restores modules that imported a wrapper while enabled
+        _rebind(_state.wrappers)
+        _state.patches = []
+        _state.rebinds = []
+        _state.wrappers = {}
+        _state.pending = {}
+        if _finder in sys.meta_path:
+            sys.meta_path.remove(_finder)
+        _state.enabled = False
+
+def is_enabled():
+    return _state.enabled
+
+def patched():
+    """Names of the bindings swapped for timing wrappers, as (module or class, attribute) pairs."""
+    names = []
+    for owner, attribute, _, _ in _state.patches:
+        owner_name = f"{owner.__module__}.{owner.__qualname__}" if isinstance(owner, type) else owner.__name__
+        names.append((owner_name, attribute))
+    return names + list(_state.rebinds)
+
+def reset():
+    """Clear the statistics (and trace) without changing what is instrumented."""
+    for stats in _state.stats.values():
+        stats.count, stats.total, stats.max = 0, 0.0, 0.0
+        stats.samples.clear()
+    if _state.trace is not None:
+        _state.trace.clear()
+
+def snapshot():
+    """Per-function dict of count, total, mean, max, p50, p90 and p99 (seconds)."""
+    return {name: stats.summary() for name, stats in _state.stats.items() if stats.count}
+
+def dump_json(path):
+    with open(path, "w") as f:
+        json.dump({"enabled": _state.enabled, "functions": snapshot()}, f, indent=2)
+        f.write("\n")
+
+def dump_chrome_trace(path):
+    """Write the traced calls as Chrome trace events (chrome://tracing, Perfetto)."""
+    if _state.trace is None:
+        raise RuntimeError("enable(trace=True) to record individual calls")
+    pid = os.getpid()
+    events = [{"name": name, "ph": "X", "ts": (start - _state.origin) * 1e6, "dur": elapsed * 1e6,
+               "pid": pid, "tid": tid} for name, start, elapsed, tid in list(_state.trace)]
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
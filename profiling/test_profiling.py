@@ -0,0 +1,53 @@
+import json
+import os
+import subprocess
+import sys
+import profiling
+import kinematics
+from kinematics.kinematics import ForearmKinematics, inverse_kinematics_2d
+from control.pid_controller import PIDController
+
+def test_instrumentation_counts_calls_and_restores_originals(tmp_path):
+    compute, ik = PIDController.__dict__["compute"], inverse_kinematics_2d
+    profiling.enable(targets=["forward_kinematics", "inverse_kinematics_2d", "PIDController.compute"], trace=True)
+    try:
+        # Toda copia de la función (misma identidad) queda instrumentada, y queda registrada
+        assert kinematics.inverse_kinematics_2d is not ik and inverse_kinematics_2d is not ik
+        swapped = profiling.patched()
+        assert ("kinematics.kinematics", "inverse_kinematics_2d") in swapped
+        assert ("control.pid_controller.PIDController", "compute") in swapped
+        assert ("kinematics", "inverse_kinematics_2d") in swapped and (__name__, "inverse_kinematics_2d") in swapped
+        pid = PIDController(1.0, 0.1, 0.0, 0.01)
+        for _ in range(100):
+            pid.compute(1.0, 0.0)
+        kinematics.inverse_kinematics_2d(1.0, 1.0, 1.0, 1.0)
+        ForearmKinematics([(1.0, 0, 0, 0.1), (1.0, 0, 0, 0.2)]).forward_kinematics()
+        stats = profiling.snapshot()
+        profiling.dump_json(tmp_path / "profile.json")
+        profiling.dump_chrome_trace(tmp_path / "trace.json")
+    finally:
+        profiling.disable()
+        profiling.reset()
+
+    assert PIDController.__dict__["compute"] is compute
+    assert kinematics.inverse_kinematics_2d is ik and inverse_kinematics_2d is ik
+    assert profiling.patched() == []
+    assert stats["PIDController.compute"]["count"] == 100
+    assert stats["inverse_kinematics_2d"]["count"] == 1 and stats["forward_kinematics"]["count"] == 1
+    s = stats["PIDController.compute"]
+    assert 0 < s["p50"] <= s["p99"] <= s["max"] and abs(s["mean"] * 100 - s["total"]) < 1e-12
+    assert json.loads((tmp_path / "profile.json").read_text())["functions"].keys() == stats.keys()
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert len(events) == 102 and all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+    assert profiling.snapshot() == {}
+
+def test_plotters_are_patched_when_first_imported():
+    script = ("import sys, profiling; profiling.enable(); assert 'matplotlib' not in sys.modules; "
+              "from visualization.arm_plotter import ArmPlot2D; plot = ArmPlot2D(); "
+              "plot.update(0.1, 0.2); plot.update(0.3, 0.4); "
+              "assert profiling.snapshot()['ArmPlot2D.update']['count'] == 2; "
+              "from interface import cli; assert hasattr(cli.inverse_kinematics_2d, '__wrapped__'); "
+              "profiling.disable(); assert not hasattr(ArmPlot2D.update, '__wrapped__'); "
+              "assert not hasattr(cli.inverse_kinematics_2d, '__wrapped__')")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", script], cwd=root, check=True, capture_output=True)
@@ -0,0 +1,21 @@
+# Los plotters cargan matplotlib (y Tk) al importarse: se resuelven bajo demanda.
+import importlib
+
+from visualization.frame_timer import FrameTimer
+
+_LAZY_ATTRS = {
+    "ArmPlot2D": "visualization.arm_plotter",
+    "plot_2d_arm": "visualization.arm_plotter",
+    "ArmPlot3D": "visualization.arm_plotter_3d",
+    "render_profile": "visualization.offscreen",
+}
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        value = getattr(importlib.import_module(_LAZY_ATTRS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRS))
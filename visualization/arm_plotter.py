@@ -1,56 +1,104 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
 import matplotlib.patches as patches
+from visualization.frame_timer import FrameTimer
+from visualization.offscreen import figure_canvas
 
 class ArmPlot2D:
-    def __init__(self, parent, l1=1.0, l2=1.0):
+    def __init__(self, parent=None, l1=1.0, l2=1.0):
+        """Embed in the Tk widget `parent`, or render offscreen on an Agg canvas when it is None."""
         self.l1 = l1
         self.l2 = l2
 
-        self.fig, self.ax = plt.subplots(figsize=(4, 4))
+        self.fig = Figure(figsize=(4, 4))
+        self.ax = self.fig.add_subplot(111)
         self.ax.set_xlim(-2, 2)
         self.ax.set_ylim(-2, 2)
         self.ax.set_aspect("equal")
         self.ax.grid(True)
         self.ax.set_title("2D Robotic Forearm")
 
-        self.line1, = self.ax.plot([], [], 'o-', lw=4, label='Link 1')
-        self.line2, = self.ax.plot([], [], 'o-', lw=4, label='Link 2')
-        self.arc_patch = None
-        self.ax.legend()
+        self.line1, = self.ax.plot([], [], 'o-', lw=4, label='Link 1', animated=True)
+        self.line2, = self.ax.plot([], [], 'o-', lw=4, label='Link 2', animated=True)
+        # Arco de restricción reutilizado: update() solo mueve su centro y ángulo
+        self.arc_patch = patches.Arc(
+            (0, 0),
+            2 * self.l2, 2 * self.l2,
+            color='red',
+            linestyle='--',
+            linewidth=1,
+            alpha=0.4,
+            zorder=0,
+            visible=False,
+            animated=True
+        )
+        self.ax.add_patch(self.arc_patch)
+        # Posición fija: la leyenda queda en el fondo cacheado y no puede depender de la pose
+        self.ax.legend(loc='upper right')
+        self.artists = (self.arc_patch, self.line1, self.line2)
 
-        self.canvas = FigureCanvasTkAgg(self.fig, master=parent)
-        self.canvas_widget = self.canvas.get_tk_widget()
-        self.canvas_widget.pack(pady=5)
+        # Sin ventana Tk (parent=None) el lienzo es Agg, para renderizar fuera de pantalla
+        self.canvas, self.canvas_widget = figure_canvas(self.fig, parent)
+
+        self.frame_timer = FrameTimer()
+        self.background = None
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+
+    def on_draw(self, event=None):
+        """Cache the static background (grid, axes, legend) after every full draw."""
+        if getattr(self.canvas, "supports_blit", False):
+            self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        for artist in self.artists:
+            self.ax.draw_artist(artist)
 
     def update(self, theta1, theta2, elbow_limit_deg=None):
-        x0, y0 = 0, 0
-        x1 = self.l1 * np.cos(theta1)
-        y1 = self.l1 * np.sin(theta1)
-        x2 = x1 + self.l2 * np.cos(theta1 + theta2)
-        y2 = y1 + self.l2 * np.sin(theta1 + theta2)
-
-        self.line1.set_data([x0, x1], [y0, y1])
-        self.line2.set_data([x1, x2], [y1, y2])
-
-        # Restricción visual (arco)
-        if elbow_limit_deg is not None:
-            if self.arc_patch:
-                self.arc_patch.remove()
-
-            self.arc_patch = patches.Arc(
-                (x1, y1),
-                2 * self.l2, 2 * self.l2,
-                angle=np.rad2deg(theta1),
-                theta1=-elbow_limit_deg,
-                theta2=elbow_limit_deg,
-                color='red',
-                linestyle='--',
-                linewidth=1,
-                alpha=0.4,
-                zorder=0
-            )
-            self.ax.add_patch(self.arc_patch)
-
-        self.canvas.draw()
+        with self.frame_timer:
+            x0, y0 = 0, 0
+            x1 = self.l1 * np.cos(theta1)
+            y1 = self.l1 * np.sin(theta1)
+            x2 = x1 + self.l2 * np.cos(theta1 + theta2)
+            y2 = y1 + self.l2 * np.sin(theta1 + theta2)
+
+            self.line1.set_data([x0, x1], [y0, y1])
+            self.line2.set_data([x1, x2], [y1, y2])
+
+            # Restricción visual (arco)
+            if elbow_limit_deg is not None:
+                self.arc_patch.center = (x1, y1)
+                self.arc_patch.angle = np.rad2deg(theta1)
+                self.arc_patch.theta1 = -elbow_limit_deg
+                self.arc_patch.theta2 = elbow_limit_deg
+            self.arc_patch.set_visible(elbow_limit_deg is not None)
+
+            if self.background is None:
+                self.canvas.draw_idle()
+            else:
+                self.canvas.restore_region(self.background)
+                for artist in self.artists:
+                    self.ax.draw_artist(artist)
+                self.canvas.blit(self.fig.bbox)
+
+def plot_2d_arm(theta1, theta2, l1=1.0, l2=1.0, elbow_limit_deg=None):
+    """Plot one arm pose in a standalone matplotlib window (no Tk parent needed)."""
+    x1 = l1 * np.cos(theta1)
+    y1 = l1 * np.sin(theta1)
+    x2 = x1 + l2 * np.cos(theta1 + theta2)
+    y2 = y1 + l2 * np.sin(theta1 + theta2)
+
+    fig, ax = plt.subplots(figsize=(4, 4))
+    reach = l1 + l2
+    ax.set_xlim(-reach, reach)
+    ax.set_ylim(-reach, reach)
+    ax.set_aspect("equal")
+    ax.grid(True)
+    ax.set_title("2D Robotic Forearm")
+    ax.plot([0, x1], [0, y1], 'o-', lw=4, label='Link 1')
+    ax.plot([x1, x2], [y1, y2], 'o-', lw=4, label='Link 2')
+    if elbow_limit_deg is not None:
+        ax.add_patch(patches.Arc((x1, y1), 2 * l2, 2 * l2, angle=np.rad2deg(theta1),
+                                 theta1=-elbow_limit_deg, theta2=elbow_limit_deg,
+                                 color='red', linestyle='--', linewidth=1, alpha=0.4, zorder=0))
+    ax.legend()
+    plt.show()
+    return fig
@@ -1,10 +1,12 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from visualization.frame_timer import FrameTimer
+from visualization.offscreen import figure_canvas
 
 class ArmPlot3D:
-    def __init__(self, parent, l1=1.0, l2=1.0):
+    def __init__(self, parent=None, l1=1.0, l2=1.0):
+        """Embed in the Tk widget `parent`, or render offscreen on an Agg canvas when it is None."""
         self.l1 = l1
         self.l2 = l2
 
@@ -18,43 +20,52 @@ class ArmPlot3D:
         self.ax.set_zlabel("Z")
         self.ax.set_title("3D Robotic Forearm")
 
-        self.canvas = FigureCanvasTkAgg(self.fig, master=parent)
-        self.canvas_widget = self.canvas.get_tk_widget()
-        self.canvas_widget.pack(pady=5)
+        # Artistas creados una sola vez; update() solo cambia sus datos
+        self.line1, = self.ax.plot([], [], [], 'o-', lw=4, label='Link 1', animated=True)
+        self.line2, = self.ax.plot([], [], [], 'o-', lw=4, label='Link 2', animated=True)
+        self.arc_line, = self.ax.plot([], [], [], 'r--', lw=1, alpha=0.4, label='Elbow limit', animated=True)
+        self.ax.legend(loc='upper right')  # fija, como en ArmPlot2D
+        self.artists = (self.line1, self.line2, self.arc_line)
+        self.arc_angles = np.linspace(-1, 1, 50)
 
-    def update(self, theta1, theta2, elbow_limit_deg=None):
-        self.ax.cla()
-        self.ax.set_xlim([-2, 2])
-        self.ax.set_ylim([-2, 2])
-        self.ax.set_zlim([-0.5, 0.5])
-        self.ax.set_xlabel("X")
-        self.ax.set_ylabel("Y")
-        self.ax.set_zlabel("Z")
-        self.ax.set_title("3D Robotic Forearm")
+        # Sin ventana Tk (parent=None) el lienzo es Agg, para renderizar fuera de pantalla
+        self.canvas, self.canvas_widget = figure_canvas(self.fig, parent)
 
-        # Posiciones
-        x0, y0, z0 = 0, 0, 0
-        x1 = self.l1 * np.cos(theta1)
-        y1 = self.l1 * np.sin(theta1)
-        z1 = 0
+        self.frame_timer = FrameTimer()
+        self.background = None
+        self.canvas.mpl_connect('draw_event', self.on_draw)
 
-        x2 = x1 + self.l2 * np.cos(theta1 + theta2)
-        y2 = y1 + self.l2 * np.sin(theta1 + theta2)
-        z2 = 0
+    def on_draw(self, event=None):
+        """Cache the static background after every full draw, then draw the arm on top."""
+        if getattr(self.canvas, "supports_blit", False):
+            self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        for artist in self.artists:
+            self.ax.draw_artist(artist)
 
-        # Enlaces
-        self.ax.plot([x0, x1], [y0, y1], [z0, z1], 'o-', lw=4, label='Link 1')
-        self.ax.plot([x1, x2], [y1, y2], [z1, z2], 'o-', lw=4, label='Link 2')
+    def update(self, theta1, theta2, elbow_limit_deg=None):
+        with self.frame_timer:
+            # Posiciones
+            x1 = self.l1 * np.cos(theta1)
+            y1 = self.l1 * np.sin(theta1)
+            x2 = x1 + self.l2 * np.cos(theta1 + theta2)
+            y2 = y1 + self.l2 * np.sin(theta1 + theta2)
 
-        # Visualización de límite angular en 3D
-        if elbow_limit_deg is not None:
-            limit_rad = np.deg2rad(elbow_limit_deg)
-            arc_angles = np.linspace(-limit_rad, limit_rad, 50)
-            arc_x = x1 + self.l2 * np.cos(theta1 + arc_angles)
-            arc_y = y1 + self.l2 * np.sin(theta1 + arc_angles)
-            arc_z = np.zeros_like(arc_x)
+            # Enlaces
+            self.line1.set_data_3d([0, x1], [0, y1], [0, 0])
+            self.line2.set_data_3d([x1, x2], [y1, y2], [0, 0])
 
-            self.ax.plot(arc_x, arc_y, arc_z, 'r--', lw=1, alpha=0.4, label='Elbow limit')
+            # Visualización de límite angular en 3D
+            if elbow_limit_deg is not None:
+                arc_angles = theta1 + np.deg2rad(elbow_limit_deg) * self.arc_angles
+                arc_x = x1 + self.l2 * np.cos(arc_angles)
+                arc_y = y1 + self.l2 * np.sin(arc_angles)
+                self.arc_line.set_data_3d(arc_x, arc_y, np.zeros_like(arc_x))
+            self.arc_line.set_visible(elbow_limit_deg is not None)
 
-        self.ax.legend()
-        self.canvas.draw()
+            if self.background is None:
+                self.canvas.draw_idle()
+            else:
+                self.canvas.restore_region(self.background)
+                for artist in self.artists:
+                    self.ax.draw_artist(artist)
+                self.canvas.blit(self.fig.bbox)
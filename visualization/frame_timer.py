@@ -0,0 +1,38 @@
+import time
+from collections import deque
+
+class FrameTimer:
+    def __init__(self, window=120):
+        """Rolling record of the last `window` frame render times, in seconds."""
+        self.durations = deque(maxlen=window)
+        self.frame_count = 0
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.record(time.perf_counter() - self._start)
+
+    def record(self, duration):
+        self.durations.append(duration)
+        self.frame_count += 1
+
+    @property
+    def last(self):
+        return self.durations[-1] if self.durations else 0.0
+
+    @property
+    def mean(self):
+        return sum(self.durations) / len(self.durations) if self.durations else 0.0
+
+    @property
+    def fps(self):
+        """Frames per second the renderer sustains over the window."""
+        mean = self.mean
+        return 1.0 / mean if mean > 0 else 0.0
+
+    def reset(self):
+        self.durations.clear()
+        self.frame_count = 0
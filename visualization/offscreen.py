@@ -0,0 +1,226 @@
+import io
+import os
+import shutil
+import subprocess
+from collections import deque
+import numpy as np
+
+FRAME_PATTERN = "frame_{:06d}.png"
+
+_PLOTTERS = {}
+
+def figure_canvas(fig, parent=None):
+    """
+    Canvas for a plotter figure: embedded in the Tk widget `parent`, or an
+    offscreen Agg canvas when parent is None. Returns (canvas, tk_widget or None).
+    """
+    if parent is None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        return FigureCanvasAgg(fig), None
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    canvas = FigureCanvasTkAgg(fig, master=parent)
+    widget = canvas.get_tk_widget()
+    widget.pack(pady=5)
+    return canvas, widget
+
+def _plotter(mode, l1, l2, dpi):
+    """Offscreen plotter for this process, built once and reused (same artists, same background)."""
+    key = (mode, l1, l2, dpi)
+    plot = _PLOTTERS.get(key)
+    if plot is None:
+        if mode == "2D":
+            from visualization.arm_plotter import ArmPlot2D as plot_class
+        elif mode == "3D":
+            from visualization.arm_plotter_3d import ArmPlot3D as plot_class
+        else:
+            raise ValueError(f"Unknown mode {mode!r}, expected '2D' or '3D'")
+        plot = plot_class(None, l1, l2)
+        plot.fig.set_dpi(dpi)
+        _PLOTTERS[key] = plot
+    return plot
+
+def encode_png(frame):
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.fromarray(frame).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+def render_chunk(angles, mode="2D", l1=1.0, l2=1.0, elbow_limit_deg=None, dpi=100, encode=None):
+    """
+    Render one frame per (theta1, theta2) row. Returns an (N, H, W, 4) uint8
+    RGBA array, or a list of PNG byte strings when encode="png".
+    """
+    plot = _plotter(mode, l1, l2, dpi)
+    frames = []
+    for theta1, theta2 in np.asarray(angles, dtype=float)[:, :2]:
+        plot.update(theta1, theta2, elbow_limit_deg)
+        frame = np.asarray(plot.canvas.buffer_rgba())
+        frames.append(encode_png(frame) if encode == "png" else frame.copy())
+    return frames if encode == "png" else np.stack(frames)
+
+def _render_job(args):
+    chunk, options = args
+    return render_chunk(chunk, **options)
+
+def iter_frames(angles, workers=1, chunk_size=32, **options):
+    """
+    Yield the rendered frames of `angles` (N, 2) in order.
+
+    With more than one worker the chunks are rendered in a process pool,
+    each worker keeping its own plotter; at most two chunks per worker are
+    in flight, so memory stays bounded for long profiles. `options` are
+    passed to render_chunk.
+    """
+    chunks = (angles[start:start + chunk_size] for start in range(0, len(angles), chunk_size))
+    if workers <= 1:
+        for chunk in chunks:
+            yield from render_chunk(chunk, **options)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_render_job, (np.asarray(chunk), options)))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+class PngSequenceSink:
+    def __init__(self, directory, pattern=FRAME_PATTERN):
+        """Writes each frame (PNG bytes or an RGBA array) to directory/pattern.format(index)."""
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.pattern = pattern
+        self.count = 0
+        self.encode = "png"
+
+    def write(self, frame):
+        data = frame if isinstance(frame, bytes) else encode_png(frame)
+        with open(os.path.join(self.directory, self.pattern.format(self.count)), "wb") as f:
+            f.write(data)
+        self.count += 1
+
+    def close(self):
+        pass
+
+class GifSink:
+    def __init__(self, path, fps):
+        """Animated GIF through Pillow. Frames are kept until close(), so use it for short clips."""
+        self.path = path
+        self.fps = fps
+        self.frames = []
+        self.count = 0
+        self.encode = None
+
+    def write(self, frame):
+        from PIL import Image
+
+        self.frames.append(Image.fromarray(frame).convert("RGB").quantize(colors=64))
+        self.count += 1
+
+    def close(self):
+        if self.frames:
+            self.frames[0].save(self.path, save_all=True, append_images=self.frames[1:],
+                                duration=int(round(1000 / self.fps)), loop=0)
+        self.frames = []
+
+class FfmpegSink:
+    def __init__(self, path, fps, ffmpeg="ffmpeg"):
+        """Streams raw RGBA frames into an ffmpeg process (any container ffmpeg can write)."""
+        self.executable = shutil.which(ffmpeg)
+        if self.executable is None:
+            raise RuntimeError(f"{ffmpeg} not found on PATH; write a .gif or a frame directory instead")
+        self.path = path
+        self.fps = fps
+        self.process = None
+        self.count = 0
+        self.encode = None
+
+    def write(self, frame):
+        if self.process is None:
+            height, width = frame.shape[:2]
+            self.process = subprocess.Popen(
+                [self.executable, "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgba",
+                 "-s", f"{width}x{height}", "-r", str(self.fps), "-i", "-",
+                 "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p", self.path],
+                stdin=subprocess.PIPE)
+        self.process.stdin.write(np.ascontiguousarray(frame).tobytes())
+        self.count += 1
+
+    def close(self):
+        if self.process is not None:
+            self.process.stdin.close()
+            if self.process.wait() != 0:
+                raise RuntimeError(f"ffmpeg failed writing {self.path}")
+            self.process = None
+
+def open_frame_sink(output, fps):
+    """Frame directory for paths without an extension, GIF for .gif, ffmpeg for anything else."""
+    extension = os.path.splitext(output)[1].lower()
+    if not extension or os.path.isdir(output):
+        return PngSequenceSink(output)
+    if extension == ".gif":
+        return GifSink(output, fps)
+    return FfmpegSink(output, fps)
+
+def render_profile(source, output, mode="2D", fps=None, stride=1, l1=None, l2=None, elbow_limit_deg=None,
+                   dpi=100, workers=1, chunk_size=32):
+    """
+    Render a motion profile offscreen (Agg, no Tk) to a frame directory or video.
+
+    source is an (N, 2) joint-angle array, a MotionProfile or the path of a
+    binary/CSV profile. Link lengths, frame rate and elbow limit default to the
+    profile's own when it records them. Every `stride`-th sample becomes a
+    frame. Returns the number of frames written.
+    """
+    sample_rate, link_lengths, joint_limits = 50.0, (1.0, 1.0), None
+    if isinstance(source, (str, os.PathLike)):
+        from interface.profile_io import PROFILE_EXTENSION, load_profile_binary, read_profile_csv
+
+        if str(source).endswith(PROFILE_EXTENSION):
+            source = load_profile_binary(source)
+        else:
+            source = read_profile_csv(source)
+    if hasattr(source, "samples"):
+        sample_rate, link_lengths, joint_limits = source.sample_rate, source.link_lengths, source.joint_limits
+        source = source.samples
+    if elbow_limit_deg is None and joint_limits is not None and len(joint_limits) > 1:
+        limit = np.max(np.abs(joint_limits[1]))
+        if limit < np.pi:
+            elbow_limit_deg = float(np.rad2deg(limit))
+
+    fps = sample_rate / stride if fps is None else fps
+    sink = open_frame_sink(os.fspath(output), fps)
+    options = {"mode": mode, "l1": link_lengths[0] if l1 is None else l1, "l2": link_lengths[1] if l2 is None else l2,
+               "elbow_limit_deg": elbow_limit_deg, "dpi": dpi, "encode": sink.encode}
+    try:
+        for frame in iter_frames(source[::stride], workers=workers, chunk_size=chunk_size, **options):
+            sink.write(frame)
+    finally:
+        sink.close()
+    return sink.count
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render a motion profile offscreen to frames or a video.")
+    parser.add_argument("profile", help="Binary (.fap) or CSV profile")
+    parser.add_argument("output", help="Frame directory, .gif, or any video file ffmpeg can write")
+    parser.add_argument("--mode", choices=["2D", "3D"], default="2D")
+    parser.add_argument("--fps", type=float, help="Frame rate (default: profile sample rate / stride)")
+    parser.add_argument("--stride", type=int, default=1, help="Render every n-th sample")
+    parser.add_argument("--dpi", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=32)
+    args = parser.parse_args(argv)
+
+    count = render_profile(args.profile, args.output, mode=args.mode, fps=args.fps, stride=args.stride,
+                           dpi=args.dpi, workers=args.workers, chunk_size=args.chunk_size)
+    print(f"Wrote {count} frames to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,38 @@
-from arm_plotter import plot_2d_arm
+from visualization.arm_plotter import plot_2d_arm
 import numpy as np
 
 def test_plot_arm():
     theta1 = np.pi / 4
     theta2 = np.pi / 4
     plot_2d_arm(theta1, theta2)
-test_plot_arm()
\ No newline at end of file
+test_plot_arm()
+
+def test_offscreen_render_pool_matches_serial(tmp_path):
+    import os
+    from visualization.offscreen import iter_frames, render_profile
+
+    angles = np.column_stack([np.linspace(0, np.pi, 12), np.linspace(0, 1, 12)])
+    serial = np.stack(list(iter_frames(angles, chunk_size=5, elbow_limit_deg=120)))
+    pooled = np.stack(list(iter_frames(angles, workers=2, chunk_size=5, elbow_limit_deg=120)))
+    assert serial.shape == (12, 400, 400, 4) and np.array_equal(serial, pooled)
+    assert all((serial[i] != serial[i + 1]).any() for i in range(11))
+
+    assert render_profile(angles, tmp_path / "frames", stride=2, workers=2) == 6
+    assert sorted(os.listdir(tmp_path / "frames"))[-1] == "frame_000005.png"
+    assert render_profile(angles, tmp_path / "run.gif", mode="3D") == 12
+    assert os.path.getsize(tmp_path / "run.gif") > 0
+
+def test_blitted_frames_match_full_draws():
+    from visualization.arm_plotter import ArmPlot2D
+    from visualization.arm_plotter_3d import ArmPlot3D
+
+    poses = [(0.3, 0.4, 150), (2.5, -1.0, None), (-2.0, 2.2, 90), (-0.7, -0.2, 120)]
+    for cls in (ArmPlot2D, ArmPlot3D):
+        blitted = cls()
+        for theta1, theta2, limit in poses:
+            blitted.update(theta1, theta2, elbow_limit_deg=limit)
+            full = cls()
+            full.update(theta1, theta2, elbow_limit_deg=limit)
+            assert blitted.background is not None
+            # El fondo cacheado (con la leyenda) no puede depender de la primera pose
+            assert np.array_equal(np.asarray(blitted.canvas.buffer_rgba()), np.asarray(full.canvas.buffer_rgba()))